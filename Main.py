@@ -1,24 +1,48 @@
+import importlib
+import sys
+import threading
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import seaborn as sns 
 from UI import *
-import altair as alt
-from matplotlib import pyplot as plt
-from streamlit_extras.dataframe_explorer import dataframe_explorer
-import streamlit.components.v1 as stc
-import time
-import pickle
-from pathlib import Path
-from tables import render_table_editor
-from Pro import ProPage
-from analysis import HomePage
-import streamlit_authenticator as stauth
-from data import load_and_merge_data
 from streamlit_option_menu import option_menu
+from profiling import DEV_PANEL, finish_run, show_dev_panel, stage, start_run
+
+# Page registry: menu option -> (module, page function). A page's module,
+# and the plotting stack it pulls in, is imported the first time the page
+# is selected rather than on every cold start.
+PAGES = {
+    "Home": ("analysis", "HomePage"),
+    "Database": ("database", "ProgressBar"),
+    "Projects": ("Pro", "ProPage"),
+}
+
+
+def load_page(name):
+    module_name, function_name = PAGES[name]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def start_worker():
+    """Start the snapshot worker (see snapshots.py) without waiting on its imports.
+
+    snapshots pulls in the whole analytics stack (data, store, pyarrow,
+    sqlite3, schedule), so on a cold start a thread imports it and the shell
+    renders meanwhile. Later reruns find it imported; starting is a no-op then.
+    """
+    def launch():
+        importlib.import_module("snapshots").start_worker()
+
+    if "snapshots" in sys.modules:
+        launch()
+    else:
+        threading.Thread(target=launch, name="snapshot-start", daemon=True).start()
 
 
 st.set_page_config(page_title="Home", page_icon="🌎", layout="wide")
+start_run()
+# Page views are recomputed in the background whenever the data changes
+start_worker()
 
 # Load CSS
 with open('style.css') as f:
@@ -29,7 +53,7 @@ def sideBar():
     with st.sidebar:
         selected = option_menu(
             menu_title="Menu",
-            options=[ "Home","Database", "Projects"],
+            options=list(PAGES),
             icons=["house", "key", "eye"],
             menu_icon="cast",
             default_index=0,
@@ -57,84 +81,28 @@ with st.sidebar:
 
 
 
-# PROGRESS PAGE FUNCTION
-def ProgressBar():
-    st.subheader("🕸 PM Database", divider="rainbow")
-
-    selected_table = st.selectbox("Choose Table", ["Projects", "Tasks", "Financials", "Departments"])
-
-    if selected_table == "Projects":
-        render_table_editor(
-            file_path="projects.csv",
-            key_prefix="projects",
-            id_column="Project_ID",
-            date_columns=["Start_Date", "End_Date"]
-        )
-
-    elif selected_table == "Tasks":
-        render_table_editor(
-            file_path="tasks.csv",
-            key_prefix="tasks",
-            id_column="Task_ID",
-            date_columns=["Est_Start", "Est_End", "Act_Start", "Act_End", "Last_Updated"]
-        )
-
-    elif selected_table == "Financials":
-        render_table_editor(
-            file_path="costs.csv",
-            key_prefix="costs",
-            id_column="Cost_ID"  # Adjust based on your actual ID column
-        )
-
-    elif selected_table == "Departments":
-        render_table_editor(
-            file_path="Departments.csv",
-            key_prefix="departments",
-            id_column="Department_ID"  # Adjust based on your actual ID column
-        )
-
-
-    # Progress Bar
-    st.markdown(
-        """<style>.stProgress > div > div > div > div { background-image: linear-gradient(to right, #99ff99 , #FFFF00)}</style>""",
-        unsafe_allow_html=True,
-    )
-
-    target = 3000000000
-    percent = round((target * 100) / target)  # Just for demo
-
-    my_bar = st.progress(0)
-    if percent > 100:
-        st.subheader("Target 100% Completed")
-    else:
-        st.write("You have", percent, "% of", format(target, ',d'), "TZS")
-        for percent_complete in range(percent):
-            time.sleep(0.01)
-            my_bar.progress(percent_complete + 1, text="Target percentage")
-
-
-
-
-
-
-
 # Call correct page
 selected = sideBar()
 
 
 
-if selected == "Database":
-    ProgressBar()
+page = load_page(selected)
 
-elif selected == "Home":
-   HomePage()    
+with stage(f"page.{selected}"):
+    if selected == "Database":
+        page()
 
-elif selected == "Projects":
-    ProPage()      
+    else:
+        page(start_date, end_date)
 
 # Bottom error message
 st.error(f"Business Metrics between [{start_date}] and [{end_date}]")
 
+# Stage timings (DASHBOARD_DEV_PANEL=1 shows them, DASHBOARD_PROFILE_LOG exports them)
+finish_run(selected)
+if DEV_PANEL:
+    show_dev_panel(selected)
+
 
 
 
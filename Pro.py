@@ -1,8 +1,22 @@
 import streamlit as st
-import pandas as pd 
 import plotly.graph_objects as go
 import plotly.express as px
-from data import load_and_merge_data  # adjust to your actual import path
+from plotly.subplots import make_subplots
+from snapshots import options, project_comparison, project_view, schedule_view
+from visuals.earned_value import show_project_schedule
+from visuals.figure_cache import show_figure
+from visuals.gantt_chart import gantt_height
+
+# Comparison mode: matrix columns the projects can be ordered by, and the
+# most donuts drawn (one per project, in that order)
+COMPARE_SORT = {
+    "Completion Rate": "Completion_Rate",
+    "Avg Delay": "Avg_Delay",
+    "Cost Variance (%)": "Cost_Variance_percent",
+    "Tasks": "Tasks",
+}
+MAX_DONUTS = 36
+DONUT_COLUMNS = 6
 
 # --- Dynamic Color Function for Completion Rate ---
 def get_dynamic_color(value):
@@ -33,6 +47,18 @@ def make_donut(value, label, color=None, suffix="%"):
         colors = color_map.get(color, ['#BDC3C7', '#7F8C8D'])
         color_main, color_fade = colors
 
+    st.markdown(
+        f"""
+        <div style='text-align:center; color:#ddd; font-weight:600; margin-bottom:-15px; margin-top:10px;'>
+            {label}
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    show_figure("donut", donut_figure, value, color_main, color_fade, suffix, use_container_width=False)
+
+
+def donut_figure(value, color_main, color_fade, suffix):
     fig = go.Figure(data=[go.Pie(
         values=[value, max(0, 100 - value)],
         hole=0.7,
@@ -54,42 +80,36 @@ def make_donut(value, label, color=None, suffix="%"):
         paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)',
     )
-
-    st.markdown(
-        f"""
-        <div style='text-align:center; color:#ddd; font-weight:600; margin-bottom:-15px; margin-top:10px;'>
-            {label}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    st.plotly_chart(fig, use_container_width=False)
+    return fig
 
 
 # --- Main Page ---
-def ProPage():
+def ProPage(start_date=None, end_date=None):
     st.title("🏗️ Project Overview Dashboard")
-    df = load_and_merge_data()
 
-    # --- Clean Dates ---
-    for col in ['Start_Date', 'End_Date', 'Est_Start', 'Est_End', 'Act_Start', 'Act_End']:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce', dayfirst=True)
+    mode = st.radio("View", ["Single project", "Compare projects"], horizontal=True, key="pro_mode")
+    if mode == "Compare projects":
+        show_comparison(start_date, end_date)
+        return
 
     # --- Project Filter ---
-    projects = sorted(df['Project_Name'].dropna().unique().tolist())
+    projects = options(start_date, end_date)['projects']
     selected_project = st.selectbox("📂 Select Project", projects, index=0 if projects else None)
-    filtered_df = df[df['Project_Name'] == selected_project].copy()
+    if not projects:
+        st.warning("No data available for the selected project.")
+        return
+    # KPIs, rollups and timeline bars of the selected project (see snapshots.py)
+    view = project_view(selected_project, start_date, end_date)
 
-    if filtered_df.empty:
+    if view is None:
         st.warning("No data available for the selected project.")
         return
 
-    # --- KPI Calculations ---
-    total_tasks = len(filtered_df)
-    completed = (filtered_df['Status'].str.lower() == 'completed').sum()
-    completion_rate = round((completed / total_tasks) * 100, 1) if total_tasks else 0
-    delay_rate = round(filtered_df['Delay_Days'].mean(), 1) if 'Delay_Days' in filtered_df else 0
+    kpis = view['kpis']
+    total_tasks = kpis['total_tasks']
+    completed = kpis['completed']
+    completion_rate = kpis['completion_rate']
+    delay_rate = kpis['avg_delay']
 
     # --- Donut KPI Row ---
   
@@ -98,16 +118,15 @@ def ProPage():
     with col1:
         make_donut(completion_rate, "Completion Rate", color="green")
     with col2:
-        delay_score = min((delay_rate / 10) * 100, 100)
-        make_donut(delay_score, f"Avg Delay ({delay_rate} Days)", color="red", suffix="")
+        make_donut(view['delay_score'], f"Avg Delay ({delay_rate} Days)", color="red", suffix="")
 
     # --- KPI Summary ---
     st.markdown("---")
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("📋 Total Tasks", total_tasks)
     col2.metric("✅ Completed", completed)
-    col3.metric("🚧 In Progress", (filtered_df['Status'].str.lower() == 'in progress').sum())
-    col4.metric("🗓️ Planned", (filtered_df['Status'].str.lower() == 'planned').sum())
+    col3.metric("🚧 In Progress", kpis['in_progress'])
+    col4.metric("🗓️ Planned", kpis['planned'])
 
     # --- Insights ---
     st.markdown("---")
@@ -115,45 +134,140 @@ def ProPage():
 
     # Pie: Task Status Distribution
     with col1:
-        status_counts = filtered_df['Status'].value_counts().reset_index()
-        status_counts.columns = ['Status', 'Count']
-        fig1 = px.pie(
-            status_counts,
-            names='Status',
-            values='Count',
-            title="Task Status Distribution",
-            color='Status',
-            color_discrete_map={
-                'Completed': '#2E86AB',
-                'In Progress': '#E9C46A',
-                'Planned': '#F4A261',
-                'Started': '#2A9D8F'
-            },
-            hole=0.4
-        )
-        fig1.update_layout(template="plotly_white", height=400)
-        st.plotly_chart(fig1, use_container_width=True)
+        show_figure("pro_status", status_pie, view['status_counts'], use_container_width=True)
 
     # Bar: Delay by Department
     with col2:
-        if 'Delay_Days' in filtered_df.columns:
-            dept_delay = filtered_df.groupby('Department_Name')['Delay_Days'].sum().reset_index()
-            fig2 = px.bar(
-                dept_delay,
-                x='Department_Name',
-                y='Delay_Days',
-                title="Total Delay by Department",
-                color='Department_Name',
-                color_discrete_sequence=px.colors.qualitative.Set2
-            )
-            fig2.update_layout(template="plotly_white", height=400, xaxis_title=None)
-            st.plotly_chart(fig2, use_container_width=True)
+        if view['delay_by_department'] is not None:
+            show_figure("pro_delay", department_delay_bar, view['delay_by_department'], use_container_width=True)
+
+    # --- Earned Value & Critical Path ---
+    st.markdown("---")
+    show_project_schedule(schedule_view(), selected_project)
 
     # --- Gantt Chart ---
     st.markdown("---")
     st.subheader("📅 Project Timeline (Gantt Chart)")
-    gantt_df = filtered_df.dropna(subset=['Start_Date', 'End_Date'])
-    gantt_df['Duration'] = (gantt_df['End_Date'] - gantt_df['Start_Date']).dt.days
+    gantt_df = view['timeline']
+    if len(gantt_df) < view['tasks']:
+        st.caption(f"Showing {len(gantt_df)} {view['level'].lower()} bars; narrow the date range for task detail.")
+    show_figure("pro_timeline", project_timeline, gantt_df, selected_project, use_container_width=True)
+
+
+# --- Comparison Mode ---
+def show_comparison(start_date=None, end_date=None):
+    """Every project's KPIs side by side: a sortable table and small-multiple donuts."""
+    matrix = project_comparison(start_date, end_date)
+    if matrix.empty:
+        st.warning("No projects have tasks in the selected date range.")
+        return
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_label = st.selectbox("Order projects by", list(COMPARE_SORT), key="pro_compare_sort")
+    with col2:
+        ascending = st.toggle("Ascending", value=False, key="pro_compare_ascending")
+    matrix = matrix.sort_values(COMPARE_SORT[sort_label], ascending=ascending, na_position='last')
+
+    # Column headers sort the table too
+    st.dataframe(
+        matrix,
+        hide_index=True,
+        column_config={
+            'Project_Name': st.column_config.TextColumn("Project", pinned=True),
+            'Completion_Rate': st.column_config.ProgressColumn(
+                "Completion Rate", format="%.1f%%", min_value=0, max_value=100
+            ),
+            'percent_complete': st.column_config.NumberColumn("Avg % Complete", format="%.1f%%"),
+            'Avg_Delay': st.column_config.NumberColumn("Avg Delay (Days)", format="%.1f"),
+            'Budgeted_Cost': st.column_config.NumberColumn("Budgeted Cost", format="localized"),
+            'Actual_Cost': st.column_config.NumberColumn("Actual Cost", format="localized"),
+            'Cost_Variance': st.column_config.NumberColumn("Cost Variance", format="localized"),
+            'Cost_Variance_percent': st.column_config.NumberColumn("Cost Variance (%)", format="%.1f%%"),
+        },
+    )
+
+    st.markdown("---")
+    st.subheader("✅ Completion Rate by Project")
+    donuts = matrix.head(MAX_DONUTS)
+    if len(donuts) < len(matrix):
+        st.caption(f"Showing the first {len(donuts)} of {len(matrix)} projects by {sort_label.lower()}.")
+    show_figure(
+        "pro_compare_donuts", comparison_donuts, donuts[['Project_Name', 'Completion_Rate']],
+        use_container_width=True,
+    )
+
+
+# --- Figure builders (pure, so their results can be cached) ---
+def comparison_donuts(donuts):
+    """One completion donut per project, DONUT_COLUMNS to a row."""
+    rows = -(-len(donuts) // DONUT_COLUMNS)
+    fig = make_subplots(
+        rows=rows,
+        cols=DONUT_COLUMNS,
+        specs=[[{"type": "domain"}] * DONUT_COLUMNS] * rows,
+        subplot_titles=list(donuts['Project_Name'].astype(str)),
+        vertical_spacing=0.3 / rows,
+    )
+    for i, value in enumerate(donuts['Completion_Rate'].fillna(0)):
+        fig.add_trace(
+            go.Pie(
+                values=[value, max(0, 100 - value)],
+                hole=0.7,
+                marker_colors=[get_dynamic_color(value), "#D1CAFF"],
+                textinfo='none',
+                hoverinfo='skip',
+                sort=False,
+                title=dict(text=f"<b>{value:.0f}%</b>", font=dict(size=16, color=get_dynamic_color(value))),
+            ),
+            row=i // DONUT_COLUMNS + 1,
+            col=i % DONUT_COLUMNS + 1,
+        )
+    fig.update_annotations(font_size=11)
+    fig.update_layout(
+        height=190 * rows,
+        showlegend=False,
+        margin=dict(l=5, r=5, t=30, b=5),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+
+def status_pie(status_data):
+    fig1 = px.pie(
+        status_data,
+        names='Status',
+        values='Count',
+        title="Task Status Distribution",
+        color='Status',
+        color_discrete_map={
+            'Completed': '#2E86AB',
+            'In Progress': '#E9C46A',
+            'Planned': '#F4A261',
+            'Started': '#2A9D8F'
+        },
+        hole=0.4
+    )
+    fig1.update_layout(template="plotly_white", height=400)
+    return fig1
+
+
+def department_delay_bar(dept_delay):
+    fig2 = px.bar(
+        dept_delay,
+        x='Department_Name',
+        y='Delay_Days',
+        title="Total Delay by Department",
+        color='Department_Name',
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    fig2.update_layout(template="plotly_white", height=400, xaxis_title=None)
+    return fig2
+
+
+def project_timeline(gantt_df, selected_project):
+    gantt_df = gantt_df.assign(Duration=(gantt_df['End_Date'] - gantt_df['Start_Date']).dt.days)
 
     fig4 = px.timeline(
         gantt_df,
@@ -171,7 +285,7 @@ def ProPage():
         hover_data=['Department_Name', 'Duration']
     )
     fig4.update_yaxes(autorange="reversed")
-    fig4.update_layout(template="plotly_white", height=700, margin=dict(l=100, r=30, t=50, b=50))
-    st.plotly_chart(fig4, use_container_width=True)
+    fig4.update_layout(template="plotly_white", height=gantt_height(len(gantt_df)), margin=dict(l=100, r=30, t=50, b=50))
+    return fig4
 
 
@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+
+from profiling import profiled
+from schema import parse_numbers
+
+# Grain of the KPI cube. Every chart rollup is a sum over some of these keys,
+# so the cube is the only pass over task rows a rerun needs.
+CUBE_KEYS = ["Project_ID", "Project_Name", "Department_Name", "Status"]
+
+MEASURES = [
+    "tasks", "delay_sum", "delay_n", "pct_sum", "pct_n",
+    "budget_sum", "actual_sum", "impact_sum", "impact_n",
+]
+
+
+def _numeric(series):
+    if series.dtype.kind in "biuf":
+        return series
+    return parse_numbers(series)
+
+
+def _cube_key(series):
+    """Dimension values with gaps labelled 'Unknown'; categoricals stay coded."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if 'Unknown' not in series.cat.categories:
+            series = series.cat.add_categories('Unknown')
+        return series.fillna('Unknown')
+    return series.astype(object).where(series.notna(), 'Unknown')
+
+
+def _row_measures(df):
+    """Additive per-task measures, keyed by the cube dimensions."""
+    delay = _numeric(df['Delay_Days'])
+    pct = _numeric(df['percent_complete'])
+    budget = _numeric(df['Budgeted_Cost']).fillna(0)
+    actual = _numeric(df['Actual_Cost']).fillna(0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        impact = (actual - budget) / budget * 100
+
+    rows = pd.DataFrame({key: _cube_key(df[key]) for key in CUBE_KEYS})
+    rows['tasks'] = 1
+    rows['delay_sum'] = delay.fillna(0)
+    rows['delay_n'] = delay.notna().astype(int)
+    rows['pct_sum'] = pct.fillna(0)
+    rows['pct_n'] = pct.notna().astype(int)
+    rows['budget_sum'] = budget
+    rows['actual_sum'] = actual
+    rows['impact_sum'] = impact.fillna(0)
+    rows['impact_n'] = impact.notna().astype(int)
+    return rows
+
+
+def build_kpi_cube(df):
+    """Sum the task measures per project, department and status in one groupby."""
+    cube = _row_measures(df).groupby(CUBE_KEYS, sort=False, observed=True)[MEASURES].sum()
+    # Plain labels in the index, so cubes built from different frames combine
+    cube.index = pd.MultiIndex.from_arrays(
+        [cube.index.get_level_values(key).astype(object) for key in CUBE_KEYS], names=CUBE_KEYS
+    )
+    return cube
+
+
+def apply_delta(cube, removed, added):
+    """Patch `cube` with merged rows that were removed and (re)added by an edit."""
+    parts = [cube]
+    if len(removed):
+        parts.append(-build_kpi_cube(removed))
+    if len(added):
+        parts.append(build_kpi_cube(added))
+    cube = pd.concat(parts).groupby(level=CUBE_KEYS, sort=False).sum()
+    return cube[cube['tasks'] > 0]
+
+
+@profiled("rollup", rows=len)
+def _rollup(cube, keys, project=None):
+    if project is not None:
+        cube = cube[cube.index.get_level_values('Project_Name') == project]
+    return cube.groupby(level=keys).sum().reset_index()
+
+
+# --- Rollups served to the charts ---
+def project_names(cube):
+    names = cube.index.get_level_values('Project_Name').unique()
+    return sorted(name for name in names if name != 'Unknown')
+
+
+def department_names(cube):
+    names = cube.index.get_level_values('Department_Name').unique()
+    return sorted(name for name in names if name != 'Unknown')
+
+
+def totals(cube):
+    """Portfolio-level KPI values for the summary cards."""
+    sums = cube.sum()
+    project_ids = cube.index.get_level_values('Project_ID')
+    return {
+        'total_projects': project_ids[project_ids != 'Unknown'].nunique(),
+        'total_tasks': int(sums['tasks']),
+        'total_delay': sums['delay_sum'],
+        'avg_completion': sums['pct_sum'] / sums['pct_n'] if sums['pct_n'] else 0,
+        'total_budget': sums['budget_sum'],
+        'total_actual_cost': sums['actual_sum'],
+    }
+
+
+def delay_by_department(cube, project=None):
+    data = _rollup(cube, ['Department_Name'], project)
+    return data[['Department_Name']].assign(Delay_Days=data['delay_sum'])
+
+
+def completion_by_project(cube):
+    data = _rollup(cube, ['Project_Name'])
+    data['percent_complete'] = data['pct_sum'] / data['pct_n'].where(data['pct_n'] > 0)
+    return data[['Project_Name', 'percent_complete']]
+
+
+def cost_by_project(cube):
+    data = _rollup(cube, ['Project_Name'])
+    return data[['Project_Name']].assign(Budgeted_Cost=data['budget_sum'], Actual_Cost=data['actual_sum'])
+
+
+def delay_heatmap(cube):
+    """Mean delay per department x project; missing delays count as zero."""
+    data = _rollup(cube, ['Department_Name', 'Project_Name'])
+    data['Delay_Days'] = data['delay_sum'] / data['tasks']
+    return data.pivot(index='Department_Name', columns='Project_Name', values='Delay_Days').fillna(0)
+
+
+def department_summary(cube):
+    data = _rollup(cube, ['Department_Name'])
+    return pd.DataFrame({
+        'Department_Name': data['Department_Name'],
+        'Task_ID': data['tasks'],
+        'percent_complete': data['pct_sum'] / data['pct_n'].where(data['pct_n'] > 0),
+        'Delay_Days': data['delay_sum'] / data['tasks'],
+    })
+
+
+def delay_cost_impact(cube):
+    data = _rollup(cube, ['Department_Name'])
+    return pd.DataFrame({
+        'Department_Name': data['Department_Name'],
+        'Delay_Days': data['delay_sum'] / data['tasks'],
+        'Cost_Impact': data['impact_sum'] / data['impact_n'].where(data['impact_n'] > 0),
+    })
+
+
+def status_counts(cube, project=None):
+    data = _rollup(cube, ['Status'], project)
+    data = data[data['Status'] != 'Unknown'].sort_values('tasks', ascending=False)
+    return pd.DataFrame({'Status': data['Status'], 'Count': data['tasks']})
+
+
+def project_kpis(cube, project):
+    """Task counts and average delay for one project."""
+    data = _rollup(cube, ['Status'], project)
+    status = data['Status'].str.lower()
+    total = int(data['tasks'].sum())
+    completed = int(data.loc[status == 'completed', 'tasks'].sum())
+    delay_n = data['delay_n'].sum()
+    return {
+        'total_tasks': total,
+        'completed': completed,
+        'in_progress': int(data.loc[status == 'in progress', 'tasks'].sum()),
+        'planned': int(data.loc[status == 'planned', 'tasks'].sum()),
+        'completion_rate': round(completed / total * 100, 1) if total else 0,
+        'avg_delay': round(data['delay_sum'].sum() / delay_n, 1) if delay_n else 0,
+    }
+
+
+def project_matrix(cube):
+    """KPIs of every project side by side, from one rollup of the cube.
+
+    One row per project: task count, completion rate (share of tasks
+    completed, as in `project_kpis`), mean percent complete, average delay,
+    costs and their variance, then a task count per status.
+    """
+    data = _rollup(cube, ['Project_Name', 'Status'])
+    data = data[data['Project_Name'] != 'Unknown'].set_index(['Project_Name', 'Status'])
+    sums = data.groupby(level='Project_Name').sum()
+    counts = data['tasks'].unstack('Status', fill_value=0).drop(columns='Unknown', errors='ignore')
+    counts = counts[counts.sum().sort_values(ascending=False).index]
+    completed = counts.loc[:, counts.columns.str.lower() == 'completed'].sum(axis=1)
+
+    tasks = sums['tasks']
+    variance = sums['actual_sum'] - sums['budget_sum']
+    matrix = pd.DataFrame({
+        'Tasks': tasks,
+        'Completion_Rate': (completed / tasks * 100).round(1),
+        'percent_complete': sums['pct_sum'] / sums['pct_n'].where(sums['pct_n'] > 0),
+        'Avg_Delay': (sums['delay_sum'] / sums['delay_n'].where(sums['delay_n'] > 0)).round(1).fillna(0),
+        'Budgeted_Cost': sums['budget_sum'],
+        'Actual_Cost': sums['actual_sum'],
+        'Cost_Variance': variance,
+        'Cost_Variance_percent': variance / sums['budget_sum'].where(sums['budget_sum'] != 0) * 100,
+    })
+    return matrix.join(counts.astype(int)).reset_index()
+
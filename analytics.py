@@ -0,0 +1,190 @@
+"""Dashboard analytics without Streamlit.
+
+Each view function returns the numbers one page shows, as plain values and
+DataFrames, so they can be computed in batch jobs or benchmarks and the
+pages only render them. Nothing here imports Streamlit or Plotly.
+"""
+import numpy as np
+
+from aggregates import (
+    completion_by_project, cost_by_project, delay_by_department, delay_cost_impact,
+    delay_heatmap, department_names, department_summary, project_kpis, project_matrix,
+    project_names, status_counts, totals,
+)
+from data import load_date_failures, load_filtered, load_kpi_cube, load_last_updated
+from profiling import profiled
+from schedule import (
+    SCHEDULE_COLUMNS, critical_path, dependency_edges, earned_value, path_summary,
+    status_date, task_table, with_indices,
+)
+
+# Columns the Gantt reads for the filtered rows
+GANTT_COLUMNS = ['Task_Name', 'Project_Name', 'Department_Name', 'Start_Date', 'End_Date', 'Status']
+# Columns the Projects page reads for the selected project
+PROJECT_COLUMNS = [
+    'Task_Name', 'Status', 'Delay_Days', 'Project_Name', 'Department_Name',
+    'Start_Date', 'End_Date', 'Est_Start', 'Est_End', 'Act_Start', 'Act_End',
+]
+
+# Most bars one Gantt view draws; past this, tasks collapse into summary bars
+MAX_GANTT_ROWS = 400
+DETAIL_LEVELS = ["Auto", "Tasks", "Departments", "Projects"]
+
+
+# --- Timeline ---
+@profiled("gantt.level_of_detail", rows=lambda result: len(result[0]))
+def level_of_detail(df, detail="Auto", max_rows=MAX_GANTT_ROWS):
+    """Bars for one view: tasks, or summaries per department/project, capped.
+
+    "Auto" shows task bars while they fit, then one bar per department within
+    each project, then one per project. Returns (bars, level used).
+    """
+    if detail == "Auto":
+        if len(df) <= max_rows:
+            detail = "Tasks"
+        elif df.groupby(['Project_Name', 'Department_Name'], observed=True).ngroups <= max_rows:
+            detail = "Departments"
+        else:
+            detail = "Projects"
+
+    if detail == "Tasks":
+        return df.nsmallest(max_rows, 'Start_Date') if len(df) > max_rows else df, detail
+
+    keys = ['Project_Name', 'Department_Name'] if detail == "Departments" else ['Project_Name']
+    status = df['Status'].str.lower()
+    bars = (
+        df.assign(Done=status.eq('completed'), Planned=status.eq('planned'))
+        .groupby(keys, observed=True)
+        .agg(
+            Start_Date=('Start_Date', 'min'),
+            End_Date=('End_Date', 'max'),
+            Tasks=('Status', 'size'),
+            Done=('Done', 'sum'),
+            Planned=('Planned', 'sum'),
+        )
+        .reset_index()
+    )
+    if len(bars) > max_rows:
+        bars = bars.nlargest(max_rows, 'Tasks')
+
+    bars['Status'] = np.select(
+        [bars['Done'] == bars['Tasks'], bars['Planned'] == bars['Tasks']],
+        ['Completed', 'Planned'],
+        'In Progress',
+    )
+    if detail == "Departments":
+        bars['Task_Name'] = bars['Project_Name'].astype(str) + ' · ' + bars['Department_Name'].astype(str)
+    else:
+        bars['Department_Name'] = 'All departments'
+        bars['Task_Name'] = bars['Project_Name'].astype(str)
+    return bars.drop(columns=['Done', 'Planned']), detail
+
+
+@profiled("analytics.timeline", rows=lambda view: len(view["bars"]))
+def timeline(project=None, department=None, start=None, end=None, detail="Auto"):
+    """Gantt bars for tasks matching the filters.
+
+    Returns a dict with the bars (Duration_Days included), the detail level
+    used, the number of dated tasks behind them, and any required columns
+    missing from the loaded rows.
+    """
+    df = load_filtered(GANTT_COLUMNS, project=project, department=department, start=start, end=end)
+    missing = [col for col in GANTT_COLUMNS if col not in df.columns]
+    if missing:
+        return {"bars": df.iloc[0:0], "level": None, "tasks": 0, "missing": missing}
+
+    df = df.dropna(subset=['Start_Date', 'End_Date'])
+    bars, level = level_of_detail(df, detail)
+    bars = bars.assign(Duration_Days=(bars['End_Date'] - bars['Start_Date']).dt.days)
+    return {"bars": bars, "level": level, "tasks": len(df), "missing": []}
+
+
+# --- Page views ---
+def options(start=None, end=None):
+    """Project and department names with tasks in the date range."""
+    cube = load_kpi_cube(start, end)
+    return {"projects": project_names(cube), "departments": department_names(cube)}
+
+
+@profiled("analytics.home_view")
+def home_view(start=None, end=None):
+    """KPI values and chart rollups of the Home page for a date range."""
+    cube = load_kpi_cube(start, end)
+    return {
+        "last_updated": load_last_updated(),
+        "date_failures": load_date_failures(),
+        "kpis": totals(cube),
+        "projects": project_names(cube),
+        "departments": department_names(cube),
+        "delay_by_department": delay_by_department(cube).sort_values(by='Delay_Days', ascending=False),
+        "completion_by_project": completion_by_project(cube),
+        "cost_by_project": cost_by_project(cube),
+        "delay_heatmap": delay_heatmap(cube),
+        "department_summary": department_summary(cube),
+        "delay_cost_impact": delay_cost_impact(cube),
+    }
+
+
+@profiled("analytics.project_view")
+def project_view(project, start=None, end=None):
+    """KPIs, rollups and timeline bars of one project; None without tasks."""
+    # No project means nothing selected, not every project
+    if project is None:
+        return None
+    rows = load_filtered(PROJECT_COLUMNS, project=project, start=start, end=end)
+    if rows.empty:
+        return None
+
+    cube = load_kpi_cube(start, end)
+    kpis = project_kpis(cube, project)
+    dated = rows.dropna(subset=['Start_Date', 'End_Date'])
+    # Large projects collapse to one bar per department
+    bars, level = level_of_detail(dated)
+    return {
+        "kpis": kpis,
+        # Average delay on a 0-100 scale, 10 days or more filling the gauge
+        "delay_score": min((kpis['avg_delay'] / 10) * 100, 100),
+        "status_counts": status_counts(cube, project),
+        "delay_by_department": delay_by_department(cube, project) if 'Delay_Days' in rows.columns else None,
+        "timeline": bars,
+        "level": level,
+        "tasks": len(dated),
+    }
+
+
+@profiled("analytics.schedule_view")
+def schedule_view():
+    """Earned value and critical path of every project; None without tasks.
+
+    Covers each project's whole schedule, whatever the page's date range:
+    the S-curves run from the first start to the last planned finish, and
+    progress is read as of the latest Last_Updated.
+    """
+    tasks = task_table(load_filtered(SCHEDULE_COLUMNS))
+    if tasks.empty:
+        return None
+
+    as_of = status_date(tasks)
+    pred, succ, links = dependency_edges(tasks)
+    path = critical_path(tasks, (pred, succ))
+    curves = earned_value(tasks, as_of)
+    summary = (
+        curves[curves['Date'] == as_of].drop(columns='Date')
+        .merge(tasks.groupby('Project_Name', observed=True)['BAC'].sum().reset_index(), on='Project_Name')
+        .merge(path_summary(path), on='Project_Name', how='left')
+    )
+    portfolio = with_indices(curves.groupby('Date')[['PV', 'EV', 'AC']].sum().reset_index())
+    return {
+        "as_of": as_of,
+        "links": links,
+        "curves": curves,
+        "portfolio": portfolio,
+        "summary": summary,
+        "path": path,
+    }
+
+
+@profiled("analytics.project_comparison", rows=len)
+def project_comparison(start=None, end=None):
+    """KPI matrix of every project with tasks in the date range (see project_matrix)."""
+    return project_matrix(load_kpi_cube(start, end))
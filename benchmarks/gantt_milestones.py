@@ -0,0 +1,70 @@
+"""Gantt figure build time and JSON payload size, 1k to 100k tasks.
+
+Compares the old one-trace-per-milestone loop with the batched marker
+trace. Run from the repo root:
+
+    python -m benchmarks.gantt_milestones [sizes...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from visuals.gantt_chart import build_gantt_figure
+
+SIZES = [1_000, 10_000, 100_000]
+# Per-task traces get slow quickly; beyond this the old path is skipped
+LEGACY_LIMIT = 10_000
+
+
+def synthetic_tasks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n), "D")
+    return pd.DataFrame({
+        "Task_Name": [f"Task {i}" for i in range(n)],
+        "Project_Name": rng.choice([f"Project {i}" for i in range(20)], n),
+        "Department_Name": rng.choice(["Civil", "Mechanical", "Electrical", "HSE"], n),
+        "Start_Date": start,
+        "End_Date": start + pd.to_timedelta(rng.integers(1, 60, n), "D"),
+        "Status": rng.choice(["Completed", "In Progress", "Planned", "Started"], n),
+        "Duration_Days": 0,
+    })
+
+
+def legacy_figure(df):
+    """The figure as built before milestones were batched."""
+    fig = build_gantt_figure(df)
+    fig.data = [trace for trace in fig.data if trace.name != "Milestone"]
+    completed = df[df['Status'].str.lower().isin(['completed', 'done', 'finished'])]
+    for _, row in completed.iterrows():
+        fig.add_trace(go.Scatter(
+            x=[row['End_Date']], y=[row['Task_Name']], mode="markers",
+            marker_symbol="diamond", marker_size=10, marker_color="#264653",
+            name="Milestone", showlegend=False,
+        ))
+    return fig
+
+
+def measure(build, df):
+    started = time.perf_counter()
+    fig = build(df)
+    build_seconds = time.perf_counter() - started
+    return build_seconds, len(fig.data), len(fig.to_json())
+
+
+def main(sizes):
+    print(f"{'tasks':>8} {'variant':>8} {'build_s':>8} {'traces':>7} {'json_MB':>8}")
+    for n in sizes:
+        df = synthetic_tasks(n)
+        variants = [("batched", build_gantt_figure)]
+        if n <= LEGACY_LIMIT:
+            variants.append(("legacy", legacy_figure))
+        for name, build in variants:
+            seconds, traces, payload = measure(build, df)
+            print(f"{n:>8} {name:>8} {seconds:>8.2f} {traces:>7} {payload / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
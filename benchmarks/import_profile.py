@@ -0,0 +1,96 @@
+"""Cold-start import cost of Main.py and of each page it loads lazily.
+
+Every measurement runs `python -X importtime` in a fresh interpreter, so
+nothing is already cached in sys.modules. Run from the repo root:
+
+    python -m benchmarks.import_profile [--top N] [--json results.jsonl]
+"""
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+import time
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def profile(modules):
+    """Import `modules` cold; return wall seconds and {package: cumulative us}."""
+    code = "; ".join(f"import {module}" for module in modules)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return wall, cumulative
+
+
+def top_level(cumulative, count):
+    """Heaviest top-level packages (their cumulative time includes children)."""
+    roots = {}
+    for name, micros in cumulative.items():
+        root = name.split(".")[0]
+        roots[root] = max(roots.get(root, 0), micros)
+    return sorted(roots.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def shell_imports(source):
+    """Modules Main.py imports at the top level, before any page is chosen."""
+    modules = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return modules
+
+
+def run(top, json_path):
+    # Main.py executes Streamlit calls at import, so read its imports and
+    # registry from the source
+    source = open("Main.py", encoding="utf-8").read()
+    shell = shell_imports(source)
+    pages = dict(re.findall(r'"(\w+)": \("(\w+)", "\w+"\)', source))
+
+    rows = [("shell", shell)]
+    rows += [(page, shell + [module]) for page, module in pages.items()]
+
+    shell_wall = None
+    records = []
+    print(f"{'target':>10} {'wall_s':>7} {'extra_s':>8}  heaviest packages")
+    for name, modules in rows:
+        wall, cumulative = profile(modules)
+        if shell_wall is None:
+            shell_wall = wall
+        heaviest = top_level(cumulative, top)
+        records.append({
+            "target": name,
+            "modules": modules,
+            "wall_s": round(wall, 4),
+            "extra_over_shell_s": round(wall - shell_wall, 4),
+            "heaviest_us": dict(heaviest),
+        })
+        listing = ", ".join(f"{pkg} {us / 1e6:.2f}s" for pkg, us in heaviest)
+        print(f"{name:>10} {wall:>7.2f} {wall - shell_wall:>8.2f}  {listing}")
+
+    if json_path:
+        with open(json_path, "a", encoding="utf-8") as out:
+            for record in records:
+                out.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=4, help="packages listed per target")
+    parser.add_argument("--json", dest="json_path", help="append results as JSON lines")
+    args = parser.parse_args()
+    run(args.top, args.json_path)
@@ -0,0 +1,106 @@
+"""Ingestion throughput (rows/s) and peak traced memory for large task exports.
+
+Writes a synthetic tasks CSV (and optionally an Excel copy) and streams it
+into a throwaway copy of the store at several chunk sizes. Run from the
+repo root:
+
+    python -m benchmarks.ingest_throughput [rows] [--excel]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import store
+from ingest import ingest
+from schema import TABLES
+
+ROWS = 200_000
+CHUNK_SIZES = [10_000, 50_000, 200_000]
+EXCEL_LIMIT = 50_000
+
+
+def synthetic_export(n, seed=0):
+    """Tasks in the export layout: day-first text dates, percent strings, ~2% repeats."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n), "D")
+    ids = np.arange(n)
+    repeats = rng.random(n) < 0.02
+    ids[repeats] = rng.integers(0, n, repeats.sum())
+    return pd.DataFrame({
+        "Task_ID": [f"W{i:07d}" for i in ids],
+        "Project_ID": rng.choice(["P001", "P004", "P005"], n),
+        "Department_ID": rng.choice([f"D00{i}" for i in range(1, 9)], n),
+        "Task_Name": [f"Task {i}" for i in range(n)],
+        "Est_Start": start.strftime("%d-%b-%y"),
+        "Est_End": (start + pd.to_timedelta(rng.integers(1, 60, n), "D")).strftime("%d/%m/%Y"),
+        "Delay_Days": rng.integers(0, 20, n),
+        "percent_complete": [f"{p}%" for p in rng.integers(0, 101, n)],
+        "Status": rng.choice(["Completed", "In Progress", "Planned"], n),
+        "Planned_Duration": rng.integers(1, 60, n),
+    })
+
+
+def _fresh_store():
+    if os.path.exists(store.STORE_DIR):
+        shutil.rmtree(store.STORE_DIR)
+    store.sync("tasks")
+
+
+def run(path, chunk_rows):
+    """Ingest into a fresh store; returns the report, seconds and peak MB.
+
+    Timing and memory come from separate runs because tracemalloc slows
+    pandas down several times. The peak covers Python and NumPy
+    allocations, which is what grows with the chunk size.
+    """
+    _fresh_store()
+    started = time.perf_counter()
+    report = ingest(path, "tasks", chunk_rows=chunk_rows)
+    seconds = time.perf_counter() - started
+
+    _fresh_store()
+    tracemalloc.start()
+    ingest(path, "tasks", chunk_rows=chunk_rows)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return report, seconds, peak
+
+
+def main(rows, excel):
+    workdir = tempfile.mkdtemp(prefix="ingest-bench-")
+    for spec in TABLES.values():
+        shutil.copy(spec["csv"], workdir)
+    repo = os.getcwd()
+    os.chdir(workdir)
+    try:
+        export = synthetic_export(rows)
+        files = [("csv", "tasks_export.csv")]
+        export.to_csv(files[0][1], index=False)
+        if excel:
+            if rows > EXCEL_LIMIT:
+                print(f"(Excel file capped at {EXCEL_LIMIT:,} rows)")
+            files.append(("xlsx", "tasks_export.xlsx"))
+            export.head(EXCEL_LIMIT).to_excel(files[1][1], index=False)
+
+        print(f"{'format':>6} {'chunk':>8} {'rows':>9} {'written':>9} {'seconds':>8} {'rows/s':>9} {'peak_MB':>8}")
+        for kind, path in files:
+            for chunk_rows in CHUNK_SIZES:
+                report, seconds, peak = run(path, chunk_rows)
+                print(
+                    f"{kind:>6} {chunk_rows:>8} {report['rows_read']:>9} {report['rows_written']:>9} "
+                    f"{seconds:>8.2f} {report['rows_read'] / seconds:>9,.0f} {peak:>8.0f}"
+                )
+    finally:
+        os.chdir(repo)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    main(int(args[0]) if args else ROWS, "--excel" in sys.argv)
@@ -0,0 +1,100 @@
+"""Memory, merge time and KPI-cube time of the merged frame per dtype layout.
+
+"object" is the layout pandas < 3 gives the stored tables (every text
+column an object column, percents as text), "string" the Arrow-backed
+strings of pandas 3, and "compact" the declared schema (categoricals and
+float32 percents, see schema.compact_dtypes). Run from the repo root:
+
+    python -m benchmarks.merged_dtypes [tasks...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregates import build_kpi_cube
+from data import _merge
+from schema import compact_dtypes
+
+SIZES = [10_000, 200_000]
+
+
+def synthetic_tables(n, seed=0):
+    """Stored-layout tasks, projects, departments and costs for `n` tasks."""
+    rng = np.random.default_rng(seed)
+    projects = pd.DataFrame({
+        "Project_ID": [f"P{i:04d}" for i in range(200)],
+        "Project_Name": [f"Project {i}" for i in range(200)],
+        "Location": rng.choice(["Zone A", "Zone B", "Base Camp Area", "Mine Access Rd"], 200),
+        "Status": rng.choice(["Completed", "In Progress", "Planned"], 200),
+        "Project_Completion": [f"{p}%" for p in rng.integers(0, 101, 200)],
+    })
+    departments = pd.DataFrame({
+        "Department_ID": [f"D{i:03d}" for i in range(20)],
+        "Department_Name": [f"Department {i}" for i in range(20)],
+        "Manager": [f"Manager {i}" for i in range(20)],
+    })
+    task_ids = [f"T{i:07d}" for i in range(n)]
+    start = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n), "D")
+    tasks = pd.DataFrame({
+        "Task_ID": task_ids,
+        "Project_ID": rng.choice(projects["Project_ID"], n),
+        "Department_ID": rng.choice(departments["Department_ID"], n),
+        "Task_Name": [f"Task {i}" for i in range(n)],
+        "Est_Start": start,
+        "Est_End": start + pd.to_timedelta(rng.integers(1, 60, n), "D"),
+        "Delay_Days": rng.integers(0, 20, n).astype(float),
+        "percent_complete": [f"{p}%" for p in rng.integers(0, 101, n)],
+        "Assigned_To": rng.choice([f"Engineer {i}" for i in range(50)], n),
+        "Priority": rng.choice(["High", "Medium", "Low"], n),
+        "Status": rng.choice(["Completed", "In Progress", "Planned", "Started"], n),
+    })
+    costs = pd.DataFrame({
+        "Cost_ID": [f"C{i:07d}" for i in range(n)],
+        "Task_ID": task_ids,
+        "Budgeted_Cost": rng.integers(1_000, 50_000, n).astype(float),
+        "Actual_Cost": rng.integers(1_000, 55_000, n).astype(float),
+    })
+    return {"tasks": tasks, "projects": projects, "departments": departments, "costs": costs}
+
+
+def layout(tables, name):
+    tables = {table: df.copy() for table, df in tables.items()}
+    for table, df in tables.items():
+        if name == "object":
+            for col in df.columns:
+                if df[col].dtype.kind not in "biufM":
+                    df[col] = df[col].astype(object)
+        elif name == "compact":
+            compact_dtypes(df, table)
+    return tables
+
+
+def measure(tables):
+    started = time.perf_counter()
+    merged = _merge(tables["tasks"], tables["projects"], tables["departments"], tables["costs"])
+    merge_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    build_kpi_cube(merged)
+    cube_seconds = time.perf_counter() - started
+    return merged.memory_usage(deep=True).sum() / 1e6, merge_seconds, cube_seconds
+
+
+def main(sizes):
+    print(f"{'tasks':>8} {'layout':>8} {'MB':>8} {'vs_object':>9} {'merge_s':>8} {'cube_s':>7}")
+    for n in sizes:
+        tables = synthetic_tables(n)
+        baseline = None
+        for name in ["object", "string", "compact"]:
+            megabytes, merge_seconds, cube_seconds = measure(layout(tables, name))
+            baseline = baseline or megabytes
+            print(
+                f"{n:>8} {name:>8} {megabytes:>8.1f} {baseline / megabytes:>8.1f}x "
+                f"{merge_seconds:>8.3f} {cube_seconds:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
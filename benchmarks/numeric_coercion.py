@@ -0,0 +1,83 @@
+"""Percent and numeric coercion on 1M rows: per-column loop vs one pass.
+
+"legacy" is the cleanup HomePage used to run on every render (strip '%'
+from percent_complete, then to_numeric + fillna per numeric column).
+"coerce_numbers" is the single load-time pass from schema.py, and
+"render" what is left per render once the columns are typed. Run from
+the repo root:
+
+    python -m benchmarks.numeric_coercion [rows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from schema import FILL_ZERO_COLUMNS, NUMBER_COLUMNS, coerce_numbers
+
+ROWS = 1_000_000
+REPEAT = 3
+
+
+def text_frame(n, seed=0):
+    """Merged-frame numbers as they come out of the CSVs: text, some messy or blank."""
+    rng = np.random.default_rng(seed)
+    percents = rng.integers(0, 101, n).astype(str)
+    style = rng.integers(0, 3, n)
+    df = pd.DataFrame({
+        "percent_complete": np.where(style == 0, np.char.add(percents, "%"),
+                                     np.where(style == 1, np.char.add(np.char.add(" ", percents), " %"), percents)),
+        "Project_Completion": np.char.add(rng.integers(0, 101, n).astype(str), "%"),
+    })
+    for col in FILL_ZERO_COLUMNS:
+        values = rng.integers(0, 50_000, n).astype(str).astype(object)
+        values[rng.random(n) < 0.1] = ""
+        df[col] = values
+    return df.astype(object)
+
+
+def legacy(df):
+    df['percent_complete'] = df['percent_complete'].astype(str).str.replace('%', '', regex=False)
+    df['percent_complete'] = pd.to_numeric(df['percent_complete'], errors='coerce')
+    for col in FILL_ZERO_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    return df
+
+
+def single_pass(df):
+    return coerce_numbers(df, NUMBER_COLUMNS)
+
+
+def render(df):
+    df[FILL_ZERO_COLUMNS] = df[FILL_ZERO_COLUMNS].fillna(0)
+    return df
+
+
+def best_of(func, make_input):
+    times = []
+    for _ in range(REPEAT):
+        df = make_input()
+        started = time.perf_counter()
+        func(df)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(rows):
+    frame = text_frame(rows)
+    typed = single_pass(frame.copy())
+
+    legacy_s = best_of(legacy, frame.copy)
+    load_s = best_of(single_pass, frame.copy)
+    render_s = best_of(render, typed.copy)
+
+    print(f"{rows:,} rows, {len(NUMBER_COLUMNS)} columns (best of {REPEAT})")
+    print(f"{'legacy per render':<28} {legacy_s:>8.3f}s")
+    print(f"{'coerce_numbers (load, once)':<28} {load_s:>8.3f}s  {legacy_s / load_s:>6.1f}x")
+    print(f"{'per render after load':<28} {render_s:>8.3f}s  {legacy_s / render_s:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
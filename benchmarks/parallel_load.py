@@ -0,0 +1,74 @@
+"""Wall time of a cold load_and_merge_data against the cores it may use.
+
+For each core count N the loader reads the four tables on N threads
+(data.LOAD_WORKERS) and pyarrow parses on N threads of its own. "csv" times
+a first start, where every CSV is parsed and typed into the store; "parquet"
+a restart, reading the typed store. Portfolios come from
+synthetic_portfolio.py. Run from the repo root:
+
+    python -m benchmarks.parallel_load [tasks...] [--cores 1 2 4] [--repeat N]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pyarrow as pa
+
+import data
+from benchmarks.synthetic_portfolio import write_portfolio
+from store import STORE_DIR
+
+SIZES = [200_000]
+
+
+def best_of(repeat, func, setup):
+    seconds = []
+    for _ in range(repeat):
+        setup()
+        started = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - started)
+    return min(seconds)
+
+
+def cold_store():
+    shutil.rmtree(STORE_DIR, ignore_errors=True)
+    data.invalidate_cache()
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES)
+    parser.add_argument("--cores", nargs="+", type=int, default=sorted({1, 2, 4, cpus}))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    repo = os.getcwd()
+    print(f"{cpus} cores available")
+    print(f"{'tasks':>8} {'cores':>5} {'csv_s':>7} {'speedup':>7} {'parquet_s':>9} {'speedup':>7}")
+    for n in args.sizes:
+        workdir = tempfile.mkdtemp(prefix="dashboard-load-")
+        try:
+            write_portfolio(workdir, n)
+            os.chdir(workdir)
+            serial = None
+            for cores in args.cores:
+                data.LOAD_WORKERS = cores
+                pa.set_cpu_count(cores)
+                csv_seconds = best_of(args.repeat, data.load_and_merge_data, cold_store)
+                parquet_seconds = best_of(args.repeat, data.load_and_merge_data, data.invalidate_cache)
+                serial = serial or (csv_seconds, parquet_seconds)
+                print(
+                    f"{n:>8} {cores:>5} {csv_seconds:>7.3f} {serial[0] / csv_seconds:>6.2f}x "
+                    f"{parquet_seconds:>9.3f} {serial[1] / parquet_seconds:>6.2f}x"
+                )
+        finally:
+            os.chdir(repo)
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
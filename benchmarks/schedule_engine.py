@@ -0,0 +1,79 @@
+"""Critical-path and earned-value timings over synthetic portfolios.
+
+The critical path runs on the dependencies inferred from the plan, on a
+single chain of every task (the deepest graph, one project), and on listed
+predecessors forming a random DAG with three links per task. Portfolios
+come from synthetic_portfolio.py. Run from the repo root:
+
+    python -m benchmarks.schedule_engine [tasks...] [--repeat N]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import schedule
+from benchmarks.synthetic_portfolio import write_portfolio
+from data import load_filtered
+
+SIZES = [10_000, 100_000]
+
+
+def best_of(repeat, func):
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - started)
+    return min(seconds), result
+
+
+def run(tasks, repeat):
+    rows = load_filtered(schedule.SCHEDULE_COLUMNS)
+    table = schedule.task_table(rows)
+    n = len(table)
+    chain = table.sort_values('Est_Start').reset_index(drop=True).assign(Project_Name="All")
+    rng = np.random.default_rng(0)
+    successors = np.repeat(np.arange(1, n), 3)
+    random_dag = ((rng.random(len(successors)) * successors).astype(np.int64), successors)
+
+    edges = schedule.infer_predecessors(table)
+    stages = {
+        "task_table": lambda: schedule.task_table(rows),
+        "infer_predecessors": lambda: schedule.infer_predecessors(table),
+        "critical_path.inferred": lambda: schedule.critical_path(table, edges),
+        "critical_path.chain": lambda: schedule.critical_path(chain, (np.arange(n - 1), np.arange(1, n))),
+        "critical_path.random_dag": lambda: schedule.critical_path(chain, random_dag),
+        "earned_value.weekly": lambda: schedule.earned_value(table, schedule.status_date(table)),
+    }
+    for name, func in stages.items():
+        seconds, result = best_of(repeat, func)
+        # Link finders return (predecessors, successors)
+        rows = len(result[0]) if isinstance(result, tuple) else len(result)
+        print(f"{tasks:>8} {name:<26} {seconds:>8.3f} {rows:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    repo = os.getcwd()
+    print(f"{'tasks':>8} {'stage':<26} {'best_s':>8} {'rows':>8}")
+    for tasks in args.sizes:
+        workdir = tempfile.mkdtemp(prefix="dashboard-schedule-")
+        try:
+            write_portfolio(workdir, tasks)
+            os.chdir(workdir)
+            run(tasks, args.repeat)
+        finally:
+            os.chdir(repo)
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
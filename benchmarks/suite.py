@@ -0,0 +1,194 @@
+"""Headless benchmark suite over synthetic portfolios.
+
+For each size a portfolio is written to a scratch directory (see
+synthetic_portfolio.py) and every stage of a dashboard rerun is timed
+without Streamlit: CSV import, load_and_merge_data cold and warm, the
+HomePage cleaning pipeline, each KPI rollup behind the visuals, the
+analytics page views, each figure build, and a table-editor save. Run
+from the repo root:
+
+    python -m benchmarks.suite [sizes...] [--repeat N] [--out report.json] [--compare old.json]
+
+The JSON report holds one row per (tasks, stage) with the median and best
+of N runs, so two reports from different commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import aggregates
+import analytics
+import Pro
+import store
+from benchmarks.synthetic_portfolio import write_portfolio
+from data import (
+    clean_merged, invalidate_cache, load_and_merge_data, load_filtered, load_kpi_cube, refresh_after_batch,
+    sources_signature,
+)
+from schema import TABLES
+from visuals import earned_value, summary_charts
+from analytics import GANTT_COLUMNS, PROJECT_COLUMNS, level_of_detail
+from visuals.gantt_chart import build_gantt_figure
+
+SIZES = [1_000, 100_000]
+
+
+def timed(results, tasks, name, func, repeat):
+    """Run `func` `repeat` times and append its timing row; returns the last result."""
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - started)
+    rows = len(result) if hasattr(result, "__len__") and not isinstance(result, (str, dict)) else None
+    results.append({
+        "tasks": tasks, "stage": name, "median_s": statistics.median(seconds),
+        "best_s": min(seconds), "runs": repeat, "rows": rows,
+    })
+    print(f"{tasks:>9} {name:<34} {statistics.median(seconds):>9.4f} {min(seconds):>9.4f}")
+    return result
+
+
+def run_size(tasks, repeat, results):
+    """Time every stage against the portfolio in the current directory."""
+    def time_it(name, func, runs=repeat):
+        return timed(results, tasks, name, func, runs)
+
+    time_it("store.import_csv", lambda: [store.import_csv(table) for table in TABLES], 1)
+
+    def cold_load():
+        invalidate_cache()
+        return load_and_merge_data()
+
+    merged = time_it("load_and_merge_data.cold", cold_load)
+    time_it("load_and_merge_data.warm", load_and_merge_data)
+    time_it("clean_merged", lambda: clean_merged(merged.copy()))
+
+    project = merged["Project_Name"].dropna().iloc[0]
+    time_it("load_filtered.project", lambda: load_filtered(PROJECT_COLUMNS, project=project))
+    time_it("load_filtered.gantt_range", lambda: load_filtered(GANTT_COLUMNS, start="2025-02-01", end="2025-03-31"))
+
+    time_it("kpi_cube.build", lambda: aggregates.build_kpi_cube(merged))
+    cube = load_kpi_cube()
+    rollups = {
+        "totals": lambda: aggregates.totals(cube),
+        "delay_by_department": lambda: aggregates.delay_by_department(cube),
+        "completion_by_project": lambda: aggregates.completion_by_project(cube),
+        "cost_by_project": lambda: aggregates.cost_by_project(cube),
+        "delay_heatmap": lambda: aggregates.delay_heatmap(cube),
+        "department_summary": lambda: aggregates.department_summary(cube),
+        "delay_cost_impact": lambda: aggregates.delay_cost_impact(cube),
+        "status_counts": lambda: aggregates.status_counts(cube, project),
+        "project_kpis": lambda: aggregates.project_kpis(cube, project),
+        "project_matrix": lambda: aggregates.project_matrix(cube),
+    }
+    for name, func in rollups.items():
+        time_it(f"aggregate.{name}", func)
+
+    # Whole page views as the pages request them, cube and rows cached
+    time_it("analytics.home_view", analytics.home_view)
+    time_it("analytics.project_view", lambda: analytics.project_view(project))
+    time_it("analytics.timeline", analytics.timeline)
+    schedule_view = time_it("analytics.schedule_view", analytics.schedule_view)
+
+    figures = {
+        "delay_pie": (summary_charts.delay_pie, aggregates.delay_by_department(cube)),
+        "completion_bar": (summary_charts.completion_bar, aggregates.completion_by_project(cube)),
+        "cost_bars": (summary_charts.cost_bars, aggregates.cost_by_project(cube)),
+        "delay_heatmap": (summary_charts.delay_heatmap_figure, aggregates.delay_heatmap(cube)),
+        "department_scatter": (summary_charts.department_scatter, aggregates.department_summary(cube)),
+        "impact_scatter": (summary_charts.impact_scatter, aggregates.delay_cost_impact(cube)),
+        "status_pie": (Pro.status_pie, aggregates.status_counts(cube, project)),
+        "department_delay_bar": (Pro.department_delay_bar, aggregates.delay_by_department(cube, project)),
+        "comparison_donuts": (Pro.comparison_donuts, aggregates.project_matrix(cube).head(Pro.MAX_DONUTS)),
+        "performance_scatter": (earned_value.performance_scatter, schedule_view["summary"]),
+    }
+    for name, (build, data) in figures.items():
+        time_it(f"figure.{name}", lambda: build(data).data)
+
+    gantt_rows = load_filtered(GANTT_COLUMNS).dropna(subset=["Start_Date", "End_Date"])
+    bars, _ = time_it("gantt.level_of_detail", lambda: level_of_detail(gantt_rows))
+    bars = bars.assign(Duration_Days=(bars["End_Date"] - bars["Start_Date"]).dt.days)
+    time_it("figure.gantt", lambda: build_gantt_figure(bars).data)
+    time_it("figure.ev_curve", lambda: earned_value.ev_curve(schedule_view["portfolio"], schedule_view["as_of"], "").data)
+    project_rows = load_filtered(PROJECT_COLUMNS, project=project).dropna(subset=["Start_Date", "End_Date"])
+    time_it("figure.project_timeline", lambda: Pro.project_timeline(level_of_detail(project_rows)[0], project).data)
+
+    # Editor save: 100 changed tasks through the same path as the Database page
+    edits = iter(range(1_000_000))
+
+    def save():
+        stored = store.read_table("tasks")
+        edited = stored.sample(min(100, len(stored)), random_state=next(edits)).copy()
+        edited["Delay_Days"] = pd.to_numeric(edited["Delay_Days"], errors="coerce").fillna(0) + 1
+        batch = store.stage({}, "tasks", upserts=store.changed_rows("tasks", edited))
+        signature = sources_signature()
+        store.commit_batch(batch)
+        refresh_after_batch(batch, signature)
+        return batch["tasks"]["upserts"]
+
+    time_it("editor.save_100_tasks", save)
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(row["tasks"], row["stage"]): row for row in json.load(f)["results"]}
+    print(f"\n{'tasks':>9} {'stage':<34} {'before_s':>9} {'after_s':>9} {'speedup':>8}")
+    for row in results:
+        old = baseline.get((row["tasks"], row["stage"]))
+        if old:
+            speedup = old["median_s"] / row["median_s"] if row["median_s"] else float("inf")
+            print(f"{row['tasks']:>9} {row['stage']:<34} {old['median_s']:>9.4f} {row['median_s']:>9.4f} {speedup:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="benchmark_report.json")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    repo = os.getcwd()
+    out = os.path.abspath(args.out)
+    baseline = os.path.abspath(args.compare) if args.compare else None
+
+    results = []
+    print(f"{'tasks':>9} {'stage':<34} {'median_s':>9} {'best_s':>9}")
+    for tasks in args.sizes:
+        workdir = tempfile.mkdtemp(prefix="dashboard-bench-")
+        try:
+            write_portfolio(workdir, tasks)
+            os.chdir(workdir)
+            run_size(tasks, args.repeat, results)
+        finally:
+            os.chdir(repo)
+            shutil.rmtree(workdir)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"\nReport written to {out}")
+    if baseline:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
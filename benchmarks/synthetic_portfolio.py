@@ -0,0 +1,132 @@
+"""Synthetic portfolio in the dashboard's CSV layout, 1k to 1M tasks.
+
+Writes projects.csv, tasks.csv, costs.csv and departments.csv with the
+real columns and the messiness of the sample data: dates in several
+day-first layouts, percents as "45%", " 45 %" or "45", blank actuals for
+unstarted work, and a few unparseable values. Run from the repo root:
+
+    python -m benchmarks.synthetic_portfolio <tasks> <directory>
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEPARTMENTS = [
+    ("D001", "Planning", "Planner A"), ("D002", "Procurement", "Buyer B"),
+    ("D003", "Finance", "CFO C"), ("D004", "Mechanical", "Eng. M"),
+    ("D005", "Electrical", "Eng. E"), ("D006", "Instrumentation", "Eng. I"),
+    ("D007", "Civil", "Eng. C"), ("D008", "HSE", "Safety Officer"),
+]
+STATUSES = ["Completed", "In Progress", "Started", "Planned"]
+TASKS_PER_PROJECT = 100
+
+
+def _messy_dates(dates, rng, garbage=0.001):
+    """Day-first text in the layouts the sample CSVs mix, e.g. 1-Jan-2025, 14-02-2025."""
+    day = dates.dt.day.fillna(0).astype(int).astype(str)
+    layouts = [
+        day + dates.dt.strftime("-%b-%Y"),
+        dates.dt.strftime("%d-%m-%Y"),
+        day + dates.dt.strftime("-%b-%y"),
+        dates.dt.strftime("%d/%m/%Y"),
+    ]
+    pick = rng.integers(0, len(layouts), len(dates))
+    text = layouts[0].copy()
+    for i, layout in enumerate(layouts[1:], start=1):
+        text[pick == i] = layout[pick == i]
+    text[dates.isna().to_numpy()] = ""
+    text[rng.random(len(dates)) < garbage] = "TBD"
+    return text
+
+
+def _messy_percents(values, rng):
+    text = values.astype(str)
+    pick = rng.integers(0, 3, len(values))
+    return np.where(pick == 0, text + "%", np.where(pick == 1, " " + text + " %", text))
+
+
+def portfolio(tasks, seed=0):
+    """The four tables for `tasks` tasks, as CSV-ready frames."""
+    rng = np.random.default_rng(seed)
+    n_projects = max(1, tasks // TASKS_PER_PROJECT)
+
+    project_start = pd.Timestamp("2024-07-01") + pd.to_timedelta(rng.integers(0, 365, n_projects), "D")
+    project_end = project_start + pd.to_timedelta(rng.integers(60, 540, n_projects), "D")
+    projects = pd.DataFrame({
+        "Project_ID": [f"P{i:05d}" for i in range(n_projects)],
+        "Project_Name": [f"Project {i}" for i in range(n_projects)],
+        "Location": rng.choice(["Zone A", "Zone B", "Base Camp Area", "Mine Access Rd", "Plant Site"], n_projects),
+        "Start_Date": _messy_dates(pd.Series(project_start), rng, garbage=0),
+        "End_Date": _messy_dates(pd.Series(project_end), rng, garbage=0),
+        "Status": rng.choice(["Completed", "complete", "In Progress", "Planned"], n_projects),
+        "Project_Completion": _messy_percents(rng.integers(0, 101, n_projects), rng),
+    })
+    departments = pd.DataFrame(DEPARTMENTS, columns=["Department_ID", "Department_Name", "Manager"])
+
+    project = rng.integers(0, n_projects, tasks)
+    est_start = pd.Series(project_start[project] + pd.to_timedelta(rng.integers(0, 120, tasks), "D"))
+    planned = rng.integers(1, 30, tasks)
+    est_end = est_start + pd.to_timedelta(planned, "D")
+    status = rng.choice(STATUSES, tasks, p=[0.4, 0.25, 0.1, 0.25])
+    started = status != "Planned"
+    delay = np.where(started, rng.integers(0, 6, tasks), 0)
+    actual = planned + delay
+    act_start = (est_start + pd.to_timedelta(rng.integers(0, 3, tasks), "D")).where(started)
+    act_end = (act_start + pd.to_timedelta(actual, "D")).where(status == "Completed")
+    percent = np.select(
+        [status == "Completed", status == "Planned"], [100, 0], rng.integers(1, 10, tasks) * 10
+    )
+
+    task_ids = [f"T{i:07d}" for i in range(tasks)]
+    tasks_df = pd.DataFrame({
+        "Task_ID": task_ids,
+        "Project_ID": projects["Project_ID"].to_numpy()[project],
+        "Department_ID": departments["Department_ID"].to_numpy()[rng.integers(0, len(DEPARTMENTS), tasks)],
+        "Task_Name": [f"Task {i}" for i in range(tasks)],
+        "Est_Start": _messy_dates(est_start, rng),
+        "Est_End": _messy_dates(est_end, rng),
+        "Act_Start": _messy_dates(act_start, rng),
+        "Act_End": _messy_dates(act_end, rng),
+        "Delay_Days": np.where(started, delay.astype(str), ""),
+        "percent_complete": _messy_percents(percent, rng),
+        "Assigned_To": rng.choice([f"Engineer {i}" for i in range(60)], tasks),
+        "Priority": rng.choice(["High", "Medium", "Low"], tasks),
+        "Status": status,
+        "Comments": rng.choice(["", "Waiting on materials", "Weather delay", "On track"], tasks),
+        "Planned_Duration": planned,
+        "Actual_Duration": np.where(status == "Completed", actual.astype(str), ""),
+        "Last_Updated": _messy_dates(pd.Series(pd.Timestamp("2025-10-02"), index=range(tasks)), rng, garbage=0),
+    })
+
+    # Most tasks carry one cost line
+    costed = rng.random(tasks) < 0.95
+    budget = rng.integers(10, 600, tasks) * 100
+    spent = (budget * rng.uniform(0.8, 1.3, tasks)).round(-1).astype(int)
+    hours = rng.integers(5, 250, tasks)
+    worked = (hours * rng.uniform(0.8, 1.3, tasks)).astype(int)
+    costs = pd.DataFrame({
+        "Cost_ID": [f"C{i:07d}" for i in range(tasks)],
+        "Task_ID": task_ids,
+        "Budgeted_Cost": budget,
+        "Actual_Cost": spent,
+        "Hours_Allocated": hours,
+        "Hours_Worked": worked,
+        "Cost_of_Hours_Worked": worked * 120,
+        "Variance": spent - budget,
+    })[costed]
+    return {"projects": projects, "tasks": tasks_df, "costs": costs, "departments": departments}
+
+
+def write_portfolio(directory, tasks, seed=0):
+    """Write the four CSVs for `tasks` tasks into `directory`."""
+    os.makedirs(directory, exist_ok=True)
+    for table, df in portfolio(tasks, seed).items():
+        df.to_csv(os.path.join(directory, f"{table}.csv"), index=False)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    write_portfolio(sys.argv[2], int(sys.argv[1]))
@@ -1,32 +1,407 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
-def load_and_merge_data():
-    # Load datasets
-    projects_df = pd.read_csv("projects.csv", parse_dates=["Start_Date", "End_Date"])
-    for col in ["Start_Date", "End_Date"]:
-     
-     projects_df[col] = pd.to_datetime(projects_df[col], dayfirst=True, errors='coerce')
+from aggregates import apply_delta, build_kpi_cube
+from query import query_kpi_cube, query_last_updated, query_merged
+from intervals import build_interval_index, in_range, overlap_mask
+from profiling import adopt, capture, profiled, stage
+from schema import FILL_ZERO_COLUMNS, NUMBER_COLUMNS, TABLES, coerce_numbers, compact_dtypes
+from store import date_failures, read_table, table_version
+
+# "pandas" filters the cached merged frame; "sqlite" pushes page filters into
+# a local SQLite copy of the store (see query.py)
+QUERY_BACKEND = os.environ.get("DASHBOARD_QUERY_BACKEND", "pandas")
+
+# Threads reading the four tables at once; pyarrow's Parquet and CSV readers
+# release the GIL while they parse. 1 reads them one after another.
+LOAD_WORKERS = int(os.environ.get("DASHBOARD_LOAD_WORKERS", len(TABLES)))
+
+# Join keys every table must keep when only some columns are requested
+_JOIN_KEYS = {
+    "tasks": ["Task_ID", "Project_ID", "Department_ID"],
+    "projects": ["Project_ID"],
+    "departments": ["Department_ID"],
+    "costs": ["Task_ID"],
+}
+
+# --- Loader cache ---
+# Module state is kept across reruns and shared by every session on the server.
+_cache = {}
+_cubes = {}
+_intervals = {}
+_cache_lock = threading.RLock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def sources_signature():
+    """Cache key covering every stored table behind the merged frame.
+
+    Each table's version is the mtime and size of its CSV and Parquet file
+    plus the names of its pending change-log segments.
+    """
+    return tuple(table_version(table) for table in TABLES)
+
+
+def cache_stats():
+    """Hit/miss counters of the loader cache."""
+    with _cache_lock:
+        return dict(_cache_stats, entries=len(_cache))
+
+
+def invalidate_cache():
+    """Drop the cached merged frame; the next load re-reads the files."""
+    with _cache_lock:
+        _cache.clear()
+        _cubes.clear()
+        _intervals.clear()
+
+
+def _read(table, columns):
+    if columns is not None:
+        columns = _JOIN_KEYS[table] + [col for col in columns if col not in _JOIN_KEYS[table]]
+    with stage(f"load.{table}") as record:
+        df = compact_dtypes(read_table(table, columns=columns), table)
+        record["rows"] = len(df)
+    return df
+
+
+def _read_tables(columns):
+    """Every table, read and typed concurrently on LOAD_WORKERS threads."""
+    # Largest first, so they are never left waiting for a free thread
+    tables = ["tasks", "costs", "projects", "departments"]
+    if LOAD_WORKERS <= 1:
+        return {table: _read(table, columns) for table in tables}
+
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS, thread_name_prefix="load") as pool:
+        futures = {table: pool.submit(capture, _read, table, columns) for table in tables}
+        frames = {}
+        for table, future in futures.items():
+            frames[table], records = future.result()
+            adopt(records)
+    return frames
+
 
-    
+def _read_and_merge(columns=None):
+    # Load datasets (dates are stored already typed); the merge starts once all are in
+    with stage("load"):
+        frames = _read_tables(columns)
+    return _merge(frames["tasks"], frames["projects"], frames["departments"], frames["costs"])
 
-    tasks_df = pd.read_csv("tasks.csv")
-    for col in ["Est_Start", "Est_End", "Act_Start", "Act_End",]:
-     if col in tasks_df.columns:
-        tasks_df[col] = tasks_df[col].astype(str).str.replace('/', '-')
-        tasks_df[col] = pd.to_datetime(tasks_df[col], dayfirst=True, errors='coerce')
 
+def _align_categories(frames, columns):
+    """Give categorical `columns` the same categories in every frame.
 
-    costs_df = pd.read_csv("costs.csv")
-    departments_df = pd.read_csv("departments.csv")
+    Joins on shared categories compare integer codes, and concatenation
+    keeps the column categorical instead of falling back to object.
+    """
+    for col in columns:
+        if not all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames):
+            continue
+        categories = frames[0][col].cat.categories
+        for f in frames[1:]:
+            categories = categories.union(f[col].cat.categories)
+        for f in frames:
+            f[col] = f[col].cat.set_categories(categories)
 
-    # Merge tasks with projects
-    merged = tasks_df.merge(projects_df, on="Project_ID", how="left", suffixes=('', '_Project'))
 
-    # Merge with departments
-    merged = merged.merge(departments_df, on="Department_ID", how="left")
+# --- Fact table ---
+# Task rows are the facts; each dimension is attached by a lookup on its
+# key, with overlapping column names suffixed as a pandas merge would.
+_DIMENSIONS = {
+    "projects": ("Project_ID", "_Project"),
+    "departments": ("Department_ID", "_Department"),
+    "costs": ("Task_ID", "_Cost"),
+}
 
-    # Merge with costs
-    merged = merged.merge(costs_df, on="Task_ID", how="left", suffixes=('', '_Cost'))
 
+def _dimension_columns(merged, dim_columns, key, suffix):
+    """Merged column names holding the non-key columns of one dimension."""
+    return [
+        f"{col}{suffix}" if f"{col}{suffix}" in merged.columns else col
+        for col in dim_columns if col != key
+    ]
+
+
+def _join(facts, dim, key, suffix):
+    """Left join of `dim` onto `facts` on `key`.
+
+    A unique key is looked up through an index and its columns are gathered
+    with one `take` each, so the fact rows are never copied or re-sorted.
+    A repeated key (several cost rows for a task) falls back to a merge.
+    """
+    _align_categories([facts, dim], [key])
+    if not dim[key].is_unique or dim[key].isna().any():
+        return facts.merge(dim, on=key, how="left", suffixes=('', suffix))
+
+    positions = pd.Index(dim[key]).get_indexer(facts[key])
+    joined = {}
+    for col in dim.columns:
+        if col != key:
+            name = f"{col}{suffix}" if col in facts.columns else col
+            joined[name] = pd.Series(dim[col].array.take(positions, allow_fill=True), index=facts.index)
+    return facts.assign(**joined)
+
+
+@profiled("merge", rows=len)
+def _merge(tasks_df, projects_df, departments_df, costs_df):
+    merged = tasks_df
+    for table, dim in (("projects", projects_df), ("departments", departments_df), ("costs", costs_df)):
+        key, suffix = _DIMENSIONS[table]
+        merged = _join(merged, dim, key, suffix)
+    return merged
+
+
+def load_and_merge_data(columns=None):
+    """Merged tasks/projects/departments/costs frame, memoized on the source files.
+
+    The cache is keyed on the version of each stored table, so an edit on
+    disk is picked up on the next call. Pass `columns` to read only what a page
+    needs. A copy is returned because the pages clean the frame in place.
+    """
+    with _cache_lock:
+        merged = _cached_merge(sources_signature(), columns)
+    return merged.copy()
+
+
+def _cached_merge(signature, columns):
+    key = (signature, tuple(columns) if columns is not None else None)
+    merged = _cache.get(key)
+    if merged is not None:
+        _cache_stats["hits"] += 1
+        return merged
+
+    _cache_stats["misses"] += 1
+    merged = _read_and_merge(columns)
+    # Entries built from older versions of the files are dead now
+    for stale in [k for k in _cache if k[0] != signature]:
+        del _cache[stale]
+    if columns is None:
+        # An interval index is only valid for the frame it was built from
+        _intervals.pop(signature, None)
+    _cache[key] = merged
     return merged
 
+
+def _output_columns(merged_columns, columns):
+    """Merged column names that come from the requested source columns."""
+    wanted = set(columns) | {"Task_ID", "Project_ID", "Department_ID"}
+    return [
+        col for col in merged_columns
+        if col in wanted or col.removesuffix("_Project") in wanted or col.removesuffix("_Cost") in wanted
+    ]
+
+
+@profiled("load_filtered", rows=len)
+def load_filtered(columns=None, project=None, department=None, start=None, end=None):
+    """Cleaned merged rows for one page view, with its filters applied.
+
+    `start`/`end` keep tasks whose date span overlaps the range. With the
+    SQLite backend the filters run inside the query, so only the displayed
+    rows are materialized; otherwise the cached frame is filtered.
+    """
+    if QUERY_BACKEND == "sqlite":
+        df = query_merged(
+            repr(sources_signature()), columns,
+            project=project, department=department, start=start, end=end,
+        )
+        return clean_merged(df)
+
+    # One version for both lookups, so the interval index matches the frame
+    signature = sources_signature()
+    with _cache_lock:
+        merged = _cached_merge(signature, None)
+        mask = pd.Series(True, index=merged.index)
+        if project is not None:
+            mask &= merged['Project_Name'] == project
+        if department is not None:
+            mask &= merged['Department_Name'] == department
+        if start is not None or end is not None:
+            mask &= _date_mask(signature, merged, start, end)
+        selected = merged.columns if columns is None else _output_columns(merged.columns, columns)
+        df = merged.loc[mask, selected].copy()
+    return clean_merged(df)
+
+
+@profiled("clean", rows=len)
+def clean_merged(df):
+    """Normalize column names and fill gaps for display.
+
+    Numbers and percents are already typed at load time (compact_dtypes);
+    only rows from the SQLite backend still carry text to parse here.
+    """
+    df.columns = df.columns.str.strip().str.replace(' ', '_').str.replace('%', 'percent')
+
+    coerce_numbers(df, NUMBER_COLUMNS)
+    num_cols = [col for col in FILL_ZERO_COLUMNS if col in df.columns]
+    if num_cols:
+        df[num_cols] = df[num_cols].fillna(0)
+
+    obj_cols = df.select_dtypes(include='object').columns
+    for col in obj_cols:
+        df[col] = df[col].fillna('Unknown')
+
+    # Categoricals keep only the labels present in this view
+    for col in df.select_dtypes(include='category').columns:
+        df[col] = df[col].cat.remove_unused_categories()
+        if df[col].isna().any():
+            if 'Unknown' not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories('Unknown')
+            df[col] = df[col].fillna('Unknown')
+
+    df.drop_duplicates(inplace=True)
+    return df
+
+
+def _date_mask(signature, merged, start, end):
+    """Rows of the cached frame overlapping the range, via its interval index."""
+    index = _intervals.get(signature)
+    if index is None:
+        index = build_interval_index(merged)
+        _intervals.clear()
+        _intervals[signature] = index
+    return overlap_mask(index, start, end)
+
+
+# Date ranges whose KPI cubes are kept per data version
+MAX_RANGE_CUBES = 8
+
+
+def load_kpi_cube(start=None, end=None):
+    """KPI cube (see aggregates.py) of tasks overlapping the date range.
+
+    Cubes are cached per data version and range; without a range the cube
+    covers the full merged frame. With the SQLite backend the cube is summed
+    by a GROUP BY in the query, so the merged frame is never loaded.
+    """
+    signature = sources_signature()
+    key = (signature, start, end)
+    with _cache_lock:
+        cube = _cubes.get(key)
+        if cube is None:
+            cube = _build_cube(signature, start, end)
+            for stale in [k for k in _cubes if k[0] != signature]:
+                del _cubes[stale]
+            while len(_cubes) >= MAX_RANGE_CUBES:
+                del _cubes[next(iter(_cubes))]
+            _cubes[key] = cube
+    return cube
+
+
+def _build_cube(signature, start, end):
+    if QUERY_BACKEND == "sqlite":
+        with stage("kpi_cube.sql") as record:
+            cube = query_kpi_cube(repr(signature), start, end)
+            record["rows"] = int(cube["tasks"].sum())
+        return cube
+
+    merged = _cached_merge(signature, None)
+    if start is not None or end is not None:
+        merged = merged[_date_mask(signature, merged, start, end)]
+    with stage("kpi_cube", rows=len(merged)):
+        return build_kpi_cube(merged)
+
+
+def _patch(merged, table, ids):
+    """Rows of `merged` touched by saved `ids` of `table`, re-read from the store.
+
+    Returns the patched frame with the removed and added rows.
+    """
+    if table in ("projects", "departments"):
+        key, suffix = _DIMENSIONS[table]
+        dim = _read(table, None)
+        affected = merged[key].astype(str).isin(ids)
+        removed = merged[affected]
+        rows = removed.drop(columns=_dimension_columns(merged, dim.columns, key, suffix))
+        added = _join(rows, dim, key, suffix).reindex(columns=merged.columns)
+    else:
+        costs_df = read_table("costs")
+        task_ids = ids
+        if table == "costs":
+            task_ids = set(merged.loc[merged["Cost_ID"].astype(str).isin(ids), "Task_ID"].astype(str))
+            task_ids |= set(costs_df.loc[costs_df["Cost_ID"].astype(str).isin(ids), "Task_ID"].astype(str))
+
+        tasks_df = read_table("tasks")
+        tasks_df = compact_dtypes(tasks_df[tasks_df["Task_ID"].astype(str).isin(task_ids)], "tasks")
+        costs_df = compact_dtypes(costs_df[costs_df["Task_ID"].astype(str).isin(task_ids)], "costs")
+        added = _merge(tasks_df, _read("projects", None), _read("departments", None), costs_df)
+
+        affected = merged["Task_ID"].astype(str).isin(task_ids)
+        removed = merged[affected]
+    merged = merged[~affected]
+    if len(added):
+        _align_categories([merged, added], merged.columns.intersection(added.columns))
+        merged = pd.concat([merged, added], ignore_index=True)
+    return merged, removed, added
+
+
+def refresh_after_edit(edits, signature):
+    """Fold saved edits into the cached frame and KPI cubes.
+
+    `edits` maps each edited table to the ids saved, and `signature` is
+    `sources_signature()` taken before the save. Task and cost edits re-join
+    the rows of the tasks they touch; project and department edits re-attach
+    that dimension to the rows referencing the edited ids. The cubes are
+    patched with the difference. When the cache was not built from
+    `signature`, or a table outside `edits` changed on disk meanwhile, the
+    cache is dropped instead, so that change is not lost.
+    """
+    with _cache_lock:
+        merged = _cache.get((signature, None))
+        current = sources_signature()
+        others_changed = any(
+            before != after
+            for table, before, after in zip(TABLES, signature, current)
+            if table not in edits
+        )
+        if merged is None or others_changed:
+            invalidate_cache()
+            return
+
+        cubes = {key: cube for key, cube in _cubes.items() if key[0] == signature}
+        for table, ids in edits.items():
+            merged, removed, added = _patch(merged, table, set(map(str, ids)))
+            cubes = {
+                (sig, start, end): apply_delta(cube, in_range(removed, start, end), in_range(added, start, end))
+                for (sig, start, end), cube in cubes.items()
+            }
+
+        invalidate_cache()
+        _cache[(current, None)] = merged
+        for (_, start, end), cube in cubes.items():
+            _cubes[(current, start, end)] = cube
+
+
+def refresh_after_batch(batch, signature):
+    """`refresh_after_edit` for the tables of a committed store batch.
+
+    `signature` is `sources_signature()` taken before `commit_batch`.
+    """
+    edits = {}
+    for table, entry in batch.items():
+        ids = list(entry.get("deletes") or [])
+        upserts = entry.get("upserts")
+        if upserts is not None and len(upserts):
+            ids += list(upserts[TABLES[table]["id_column"]].astype(str))
+        edits[table] = ids
+    refresh_after_edit(edits, signature)
+
+
+def load_last_updated():
+    """Latest Last_Updated across all tasks.
+
+    Read straight from the cached frame: cleaning does not change dates, so
+    no filtered copy is needed.
+    """
+    if QUERY_BACKEND == "sqlite":
+        return query_last_updated(repr(sources_signature()))
+    with _cache_lock:
+        return _cached_merge(sources_signature(), None)['Last_Updated'].max()
+
+
+def load_date_failures():
+    """Unparseable date values across all tables, for the pages to report."""
+    failures = [date_failures(table).assign(Table=table) for table in TABLES]
+    return pd.concat(failures, ignore_index=True)
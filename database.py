@@ -0,0 +1,73 @@
+import streamlit as st
+from tables import render_bulk_import, render_ingest, render_table_editor
+from data import load_kpi_cube
+from aggregates import totals
+
+# Rows per page for the large tables; they are filtered and paged server-side
+EDITOR_PAGE_SIZE = 100
+
+
+# PROGRESS PAGE FUNCTION
+def ProgressBar():
+    st.subheader("🕸 PM Database", divider="rainbow")
+
+    selected_table = st.selectbox("Choose Table", ["Projects", "Tasks", "Financials", "Departments"])
+
+    if selected_table == "Projects":
+        render_table_editor(
+            table="projects",
+            key_prefix="projects",
+            id_column="Project_ID",
+            date_columns=["Start_Date", "End_Date"]
+        )
+
+    elif selected_table == "Tasks":
+        render_table_editor(
+            table="tasks",
+            key_prefix="tasks",
+            id_column="Task_ID",
+            date_columns=["Est_Start", "Est_End", "Act_Start", "Act_End", "Last_Updated"],
+            page_size=EDITOR_PAGE_SIZE
+        )
+
+    elif selected_table == "Financials":
+        render_table_editor(
+            table="costs",
+            key_prefix="costs",
+            id_column="Cost_ID",  # Adjust based on your actual ID column
+            page_size=EDITOR_PAGE_SIZE
+        )
+
+    elif selected_table == "Departments":
+        render_table_editor(
+            table="departments",
+            key_prefix="departments",
+            id_column="Department_ID"  # Adjust based on your actual ID column
+        )
+
+    with st.expander("Bulk import"):
+        render_bulk_import("bulk")
+
+    with st.expander("Ingest weekly exports"):
+        render_ingest("ingest")
+
+
+    # Progress Bar: recorded actual cost against the target. The bar is drawn
+    # at its final value and the grow animation runs in the browser.
+    st.markdown(
+        """<style>
+        .stProgress > div > div > div > div { background-image: linear-gradient(to right, #99ff99 , #FFFF00); animation: progress-grow 1s ease-out; }
+        @keyframes progress-grow { from { width: 0; } }
+        </style>""",
+        unsafe_allow_html=True,
+    )
+
+    target = 3000000000
+    actual_cost = totals(load_kpi_cube())['total_actual_cost']
+    percent = round((actual_cost * 100) / target, 2)
+
+    if percent > 100:
+        st.subheader("Target 100% Completed")
+    else:
+        st.write("You have", percent, "% of", format(target, ',d'), "TZS")
+    st.progress(min(actual_cost / target, 1.0), text="Target percentage")
@@ -0,0 +1,153 @@
+import os
+import time
+
+import pandas as pd
+
+from data import invalidate_cache
+from schema import TABLES, format_percents, normalize_dates, parse_numbers
+from store import commit_batch, stage, table_dtypes
+
+# Rows parsed, checked and appended per step. Only one chunk is held in
+# memory at a time, so a file of any size loads in bounded memory.
+CHUNK_ROWS = 50_000
+
+# Referenced tables first, so an upload of several exports resolves its keys
+LOAD_ORDER = ["projects", "departments", "tasks", "costs"]
+
+_EXCEL_SUFFIXES = (".xlsx", ".xlsm")
+
+
+def table_for(filename):
+    """Table an export belongs to, from its file name (e.g. tasks_week12.xlsx)."""
+    stem = os.path.basename(filename).rsplit(".", 1)[0].lower()
+    for table in LOAD_ORDER:
+        if stem.startswith(table):
+            return table
+    return None
+
+
+# --- Readers: yield (chunk, fraction of the file consumed) ---
+def _csv_chunks(source, chunk_rows):
+    handle = open(source, "rb") if isinstance(source, str) else source
+    size = os.path.getsize(source) if isinstance(source, str) else getattr(source, "size", None)
+    try:
+        for chunk in pd.read_csv(handle, chunksize=chunk_rows, dtype=str):
+            yield chunk, handle.tell() / size if size else None
+    finally:
+        if isinstance(source, str):
+            handle.close()
+
+
+def _excel_chunks(source, chunk_rows):
+    from openpyxl import load_workbook
+
+    book = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = book.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(value).strip() for value in next(rows)]
+        # Cells formatted as percentages hold fractions (0.45 for 45%)
+        first = next(sheet.iter_rows(min_row=2, max_row=2), ())
+        scaled = [col for col, cell in zip(header, first) if "%" in (cell.number_format or "")]
+        total = sheet.max_row
+
+        buffer, done = [], 1
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == chunk_rows:
+                done += len(buffer)
+                yield _excel_frame(buffer, header, scaled), done / total if total else None
+                buffer = []
+        if buffer:
+            yield _excel_frame(buffer, header, scaled), 1.0
+    finally:
+        book.close()
+
+
+def _excel_frame(rows, header, scaled):
+    chunk = pd.DataFrame(rows, columns=header)
+    for col in scaled:
+        chunk[col] = pd.to_numeric(chunk[col], errors="coerce") * 100
+    return chunk
+
+
+def _chunks(source, name, chunk_rows):
+    if name.lower().endswith(_EXCEL_SUFFIXES):
+        return _excel_chunks(source, chunk_rows)
+    return _csv_chunks(source, chunk_rows)
+
+
+# --- Normalization ---
+def normalize_chunk(chunk, table, dtypes):
+    """Parse dates and percents and cast columns to the stored dtypes."""
+    chunk.columns = chunk.columns.str.strip()
+    chunk, _ = normalize_dates(chunk, table)
+    for col in TABLES[table]["percent_columns"]:
+        if col in chunk.columns:
+            chunk[col] = format_percents(parse_numbers(chunk[col]))
+
+    # Chunks are typed alike, so their log segments concatenate cleanly
+    for col in chunk.columns.intersection(dtypes.index):
+        dtype = dtypes[col]
+        if dtype.kind == "M":
+            continue
+        if dtype.kind in "biuf":
+            values = pd.to_numeric(chunk[col], errors="coerce")
+            chunk[col] = values.astype(dtype) if dtype.kind == "f" or values.notna().all() else values
+        else:
+            chunk[col] = chunk[col].astype(dtype)
+    return chunk
+
+
+def ingest(source, table, name=None, chunk_rows=CHUNK_ROWS, on_progress=None):
+    """Stream a CSV or Excel export into `table`, one checked batch per chunk.
+
+    Rows are deduplicated on the table's id column (the last one wins, also
+    across chunks), rows without an id or with a broken foreign key are
+    skipped, and the rest are appended to the store. `on_progress` receives
+    the running report after every chunk; the final report is returned.
+    """
+    name = name or getattr(source, "name", str(source))
+    id_column = TABLES[table]["id_column"]
+    dtypes = table_dtypes(table)
+    report = {
+        "file": os.path.basename(name), "table": table, "chunks": 0,
+        "rows_read": 0, "rows_written": 0, "duplicates": 0, "rejected": 0,
+        "fraction": 0.0, "seconds": 0.0, "rows_per_second": 0.0,
+    }
+    rejected = []
+    started = time.perf_counter()
+
+    for chunk, fraction in _chunks(source, name, chunk_rows):
+        report["rows_read"] += len(chunk)
+        chunk = normalize_chunk(chunk, table, dtypes)
+
+        has_id = chunk[id_column].notna() & (chunk[id_column].astype(str).str.strip() != "")
+        unique = chunk[has_id].drop_duplicates(subset=id_column, keep="last")
+        report["duplicates"] += int(has_id.sum()) - len(unique)
+        report["rejected"] += int((~has_id).sum())
+
+        # Rows with a broken foreign key are left out, the rest committed
+        violations = commit_batch(stage({}, table, upserts=unique), drop_broken=True)
+        # A row can break several references; count it once
+        broken = violations["ID"].nunique()
+        if broken:
+            rejected.append(violations)
+            report["rejected"] += broken
+
+        report["chunks"] += 1
+        report["rows_written"] += len(unique) - broken
+        report["seconds"] = time.perf_counter() - started
+        report["rows_per_second"] = report["rows_read"] / report["seconds"] if report["seconds"] else 0.0
+        if fraction is not None:
+            report["fraction"] = min(fraction, 1.0)
+        if on_progress is not None:
+            on_progress(report)
+
+    report["fraction"] = 1.0
+    report["violations"] = (
+        pd.concat(rejected, ignore_index=True) if rejected
+        else pd.DataFrame(columns=["Table", "ID", "Column", "Value", "References"])
+    )
+    invalidate_cache()
+    return report
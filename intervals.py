@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from schema import task_spans
+
+
+def build_interval_index(df):
+    """Sort the task date spans of `df` once, for binary-searched range queries."""
+    starts, ends = task_spans(df)
+    starts = starts.to_numpy(dtype="datetime64[ns]")
+    ends = ends.to_numpy(dtype="datetime64[ns]")
+    # numpy sorts NaT last, so undated rows sit past every searchsorted cut
+    start_order = np.argsort(starts, kind="stable")
+    end_order = np.argsort(ends, kind="stable")
+    return {
+        "size": len(df),
+        "undated": np.flatnonzero(np.isnat(starts)),
+        "start_order": start_order,
+        "sorted_starts": starts[start_order],
+        "end_order": end_order,
+        "sorted_ends": ends[end_order],
+    }
+
+
+def _as_datetime64(value):
+    return np.datetime64(pd.Timestamp(value).to_datetime64(), "ns")
+
+
+def overlap_mask(index, start=None, end=None):
+    """Rows whose span overlaps [start, end]; undated rows never match a range.
+
+    A row misses the range only if it starts after `end` or ends before
+    `start`. Both sets are contiguous runs of the sorted arrays, so each is
+    found with one binary search.
+    """
+    mask = np.ones(index["size"], dtype=bool)
+    if start is None and end is None:
+        return mask
+    mask[index["undated"]] = False
+    if end is not None:
+        cut = np.searchsorted(index["sorted_starts"], _as_datetime64(end), side="right")
+        mask[index["start_order"][cut:]] = False
+    if start is not None:
+        cut = np.searchsorted(index["sorted_ends"], _as_datetime64(start), side="left")
+        mask[index["end_order"][:cut]] = False
+    return mask
+
+
+def in_range(df, start=None, end=None):
+    """Rows of a (small) frame overlapping the range, without an index."""
+    if start is None and end is None:
+        return df
+    span_start, span_end = task_spans(df)
+    mask = span_start.notna()
+    if start is not None:
+        mask &= span_end >= pd.Timestamp(start)
+    if end is not None:
+        mask &= span_start <= pd.Timestamp(end)
+    return df[mask]
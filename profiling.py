@@ -0,0 +1,142 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Stage timings of the current rerun. Wall time and rows are always recorded
+# (two perf_counter calls per stage); peak memory only while tracemalloc is
+# on, since it slows pandas down several times.
+DEV_PANEL = os.environ.get("DASHBOARD_DEV_PANEL") == "1"
+# Append every rerun's stages here as JSON lines, for regression tracking
+PROFILE_LOG = os.environ.get("DASHBOARD_PROFILE_LOG")
+
+# Streamlit runs each session's script in its own thread
+_local = threading.local()
+
+
+def _state():
+    if not hasattr(_local, "records"):
+        _local.records, _local.stack, _local.order = [], [], 0
+    return _local
+
+
+def start_run():
+    """Forget the stages of the previous rerun in this thread."""
+    state = _state()
+    state.records, state.stack, state.order = [], [], 0
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Time the enclosed block as stage `name`; set record["rows"] inside if known."""
+    state = _state()
+    record = {"stage": name, "depth": len(state.stack), "order": state.order, "rows": rows}
+    state.order += 1
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        # Keep the enclosing stage's peak before resetting it for this one
+        if state.stack:
+            state.stack[-1]["_peak"] = max(state.stack[-1].get("_peak", 0), peak)
+        tracemalloc.reset_peak()
+        record["_base"] = current
+    state.stack.append(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - started
+        state.stack.pop()
+        if tracing and tracemalloc.is_tracing():
+            peak = max(record.pop("_peak", 0), tracemalloc.get_traced_memory()[1])
+            record["peak_mb"] = (peak - record.pop("_base")) / 1e6
+            if state.stack:
+                state.stack[-1]["_peak"] = max(state.stack[-1].get("_peak", 0), peak)
+        record.pop("_peak", None)
+        record.pop("_base", None)
+        state.records.append(record)
+
+
+def profiled(name, rows=None):
+    """Decorator form of `stage`; `rows(result)` gives the rows processed."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name) as record:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    record["rows"] = rows(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def run_records():
+    """Stages recorded so far in this rerun, in the order they started."""
+    return sorted(_state().records, key=lambda record: record["order"])
+
+
+def capture(func, *args, **kwargs):
+    """Run `func` in a pool thread with its own records; returns (result, records)."""
+    start_run()
+    try:
+        return func(*args, **kwargs), run_records()
+    finally:
+        start_run()
+
+
+def adopt(records):
+    """Nest stages recorded by `capture` in another thread under the current stage."""
+    state = _state()
+    for record in records:
+        state.records.append(dict(record, depth=record["depth"] + len(state.stack), order=state.order + record["order"]))
+    state.order += len(records)
+
+
+def to_json_lines(records, run):
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return "".join(
+        json.dumps({"time": stamp, "run": run, **record}, default=str) + "\n" for record in records
+    )
+
+
+def finish_run(run):
+    """Append this rerun's stages to PROFILE_LOG when it is set."""
+    records = run_records()
+    if PROFILE_LOG and records:
+        with open(PROFILE_LOG, "a", encoding="utf-8") as log:
+            log.write(to_json_lines(records, run))
+    return records
+
+
+def show_dev_panel(run):
+    """Sidebar table of this rerun's stages, with a JSON lines download."""
+    import pandas as pd
+    import streamlit as st
+
+    records = run_records()
+    with st.sidebar.expander("⏱️ Stage timings"):
+        memory = st.checkbox(
+            "Track peak memory (slower, all sessions)", value=tracemalloc.is_tracing(), key="_profile_memory"
+        )
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        if not records:
+            st.caption("No stages recorded yet.")
+            return
+        table = pd.DataFrame(records)
+        table["stage"] = ["  " * depth + name for depth, name in zip(table["depth"], table["stage"])]
+        columns = ["stage", "seconds", "rows"] + (["peak_mb"] if "peak_mb" in table.columns else [])
+        total = sum(record["seconds"] for record in records if record["depth"] == 0)
+        st.caption(f"{len(records)} stages, {total:.3f}s at top level")
+        st.dataframe(table[columns], hide_index=True)
+        st.download_button(
+            "Download JSON lines", to_json_lines(records, run),
+            file_name="stage_timings.jsonl", mime="application/json",
+        )
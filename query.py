@@ -0,0 +1,263 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+
+from aggregates import CUBE_KEYS, MEASURES
+from schema import TABLES, coerce_numbers, task_spans
+from store import STORE_DIR, changes_since
+
+# Optional embedded SQL copy of the store, for pushing page filters into the
+# query. Local file only. Each table is brought up to date by replaying the
+# store's change-log segments it has not seen, so an edit costs time
+# proportional to the edit; a table is reloaded only when its CSV changed.
+DB_PATH = os.path.join(STORE_DIR, "dashboard.sqlite")
+
+_INDEXES = {
+    "tasks": ["Task_ID", "Project_ID", "Department_ID", "Span_Start", "Span_End"],
+    "projects": ["Project_ID", "Project_Name"],
+    "departments": ["Department_ID", "Department_Name"],
+    "costs": ["Cost_ID", "Task_ID"],
+}
+_SQL_DATETIME = "%Y-%m-%d %H:%M:%S"
+# Table the pending segments are staged in before they are applied
+_STAGING = "_staging"
+
+_build_lock = threading.Lock()
+
+
+def _meta(con):
+    """Stored `name -> value` rows: the data version and each table's log position."""
+    try:
+        return dict(con.execute("SELECT name, value FROM _meta"))
+    except sqlite3.Error:
+        return None
+
+
+def _prepare(table, df):
+    """Rows as SQLite holds them: numbers parsed, task spans precomputed."""
+    spec = TABLES[table]
+    df = coerce_numbers(df.copy(), spec["percent_columns"] + spec["numeric_columns"])
+    if table == "tasks":
+        starts, ends = task_spans(df)
+        df = df.assign(Span_Start=starts, Span_End=ends)
+    return df
+
+
+def _create(con, table, df):
+    df.to_sql(table, con, index=False)
+    for col in _INDEXES[table]:
+        if col in df.columns:
+            con.execute(f'CREATE INDEX "ix_{table}_{col}" ON "{table}" ("{col}")')
+
+
+def build_database(version):
+    """Load every stored table into a fresh SQLite file, with indexes."""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp_path = f"{DB_PATH}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    with closing(sqlite3.connect(tmp_path)) as con:
+        con.execute("CREATE TABLE _meta (name TEXT PRIMARY KEY, value TEXT)")
+        for table in TABLES:
+            position, df, _ = changes_since(table, None)
+            _create(con, table, _prepare(table, df))
+            con.execute("INSERT INTO _meta VALUES (?, ?)", (table, json.dumps(position)))
+        con.execute("INSERT INTO _meta VALUES ('version', ?)", (version,))
+        con.commit()
+
+    # Swap in whole so concurrent readers see either the old or the new copy
+    os.replace(tmp_path, DB_PATH)
+
+
+def _reload(con, table, df):
+    """Replace `table` with `df` in one transaction (its columns may differ)."""
+    con.execute(f'DROP TABLE IF EXISTS "{_STAGING}"')
+    df.to_sql(_STAGING, con, index=False)
+    con.execute("BEGIN")
+    con.execute(f'DROP TABLE "{table}"')
+    con.execute(f'ALTER TABLE "{_STAGING}" RENAME TO "{table}"')
+    for col in _INDEXES[table]:
+        if col in df.columns:
+            con.execute(f'CREATE INDEX "ix_{table}_{col}" ON "{table}" ("{col}")')
+
+
+def _replay(con, table, log_frames):
+    """Apply logged upserts and deletes of `table`, last write wins."""
+    id_column = TABLES[table]["id_column"]
+    log = pd.concat(log_frames, ignore_index=True)
+    log = log.drop_duplicates(subset=id_column, keep="last")
+    log[id_column] = log[id_column].astype(str)
+    columns = [col for col in _table_columns(con, table) if col in log.columns or col.startswith("Span_")]
+    staged = _prepare(table, log)[columns + ["_op"]]
+
+    con.execute(f'DROP TABLE IF EXISTS "{_STAGING}"')
+    staged.to_sql(_STAGING, con, index=False)
+    names = ", ".join(f'"{col}"' for col in columns)
+    con.execute("BEGIN")
+    con.execute(f'DELETE FROM "{table}" WHERE "{id_column}" IN (SELECT "{id_column}" FROM "{_STAGING}")')
+    con.execute(
+        f'INSERT INTO "{table}" ({names}) SELECT {names} FROM "{_STAGING}" WHERE _op = \'upsert\''
+    )
+    con.execute(f'DROP TABLE "{_STAGING}"')
+
+
+def ensure_database(version):
+    """Bring the SQLite copy up to the store `version`."""
+    with _build_lock:
+        if not os.path.exists(DB_PATH):
+            build_database(version)
+            return
+        with closing(sqlite3.connect(DB_PATH)) as con:
+            meta = _meta(con)
+            if meta is None or any(table not in meta for table in TABLES):
+                con.close()
+                build_database(version)
+                return
+            if meta.get("version") == version:
+                return
+            for table in TABLES:
+                position, df, log_frames = changes_since(table, json.loads(meta[table]))
+                if df is not None:
+                    _reload(con, table, _prepare(table, df))
+                elif log_frames:
+                    _replay(con, table, log_frames)
+                con.execute("UPDATE _meta SET value = ? WHERE name = ?", (json.dumps(position), table))
+                con.commit()
+            con.execute("UPDATE _meta SET value = ? WHERE name = 'version'", (version,))
+            con.commit()
+
+
+def _table_columns(con, table):
+    return [row[1] for row in con.execute(f'PRAGMA table_info("{table}")')]
+
+
+_JOINS = (
+    " FROM tasks t"
+    " LEFT JOIN projects p ON p.Project_ID = t.Project_ID"
+    " LEFT JOIN departments d ON d.Department_ID = t.Department_ID"
+    " LEFT JOIN costs c ON c.Task_ID = t.Task_ID"
+)
+
+
+def _span_filter(start, end):
+    """WHERE terms keeping tasks whose date span overlaps the range."""
+    where, params = [], []
+    if start is not None:
+        where.append("t.Span_End >= ?")
+        params.append(pd.Timestamp(start).strftime(_SQL_DATETIME))
+    if end is not None:
+        where.append("t.Span_Start <= ?")
+        params.append(pd.Timestamp(end).strftime(_SQL_DATETIME))
+    return where, params
+
+
+def _select_list(con):
+    """Output columns named the way data.load_and_merge_data names them."""
+    select, date_columns = [], []
+    names = set()
+
+    def add(alias, table, col, suffix=""):
+        name = f"{col}{suffix}" if col in names else col
+        names.add(name)
+        select.append((f'{alias}."{col}"', name, col))
+        if col in TABLES[table]["date_columns"]:
+            date_columns.append(name)
+
+    for col in _table_columns(con, "tasks"):
+        if col not in ("Span_Start", "Span_End"):
+            add("t", "tasks", col)
+    for col in _table_columns(con, "projects"):
+        if col != "Project_ID":
+            add("p", "projects", col, "_Project")
+    for col in _table_columns(con, "departments"):
+        if col != "Department_ID":
+            add("d", "departments", col, "_Department")
+    for col in _table_columns(con, "costs"):
+        if col != "Task_ID":
+            add("c", "costs", col, "_Cost")
+    return select, date_columns
+
+
+def query_merged(version, columns=None, project=None, department=None, start=None, end=None):
+    """Merged rows matching the filters, joined and filtered inside SQLite.
+
+    `start`/`end` keep tasks whose date span overlaps the range.
+    """
+    ensure_database(version)
+    keys = {"Task_ID", "Project_ID", "Department_ID"}
+    where, params = _span_filter(start, end)
+    if project is not None:
+        where.append("p.Project_Name = ?")
+        params.append(project)
+    if department is not None:
+        where.append("d.Department_Name = ?")
+        params.append(department)
+
+    with closing(sqlite3.connect(DB_PATH)) as con:
+        select, date_columns = _select_list(con)
+        if columns is not None:
+            wanted = keys | set(columns)
+            select = [item for item in select if item[2] in wanted]
+        sql = (
+            "SELECT " + ", ".join(f'{expr} AS "{name}"' for expr, name, _ in select)
+            + _JOINS
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY t.rowid"
+        )
+        selected = {name for _, name, _ in select}
+        parse = {col: {"format": _SQL_DATETIME} for col in date_columns if col in selected}
+        df = pd.read_sql_query(sql, con, params=params, parse_dates=parse)
+
+    for col in parse:
+        df[col] = df[col].astype("datetime64[ns]")
+    return df
+
+
+def query_kpi_cube(version, start=None, end=None):
+    """KPI cube (see aggregates.py) summed by a GROUP BY inside SQLite.
+
+    `start`/`end` keep tasks whose date span overlaps the range.
+    """
+    ensure_database(version)
+    where, params = _span_filter(start, end)
+    keys = ", ".join(f'"{key}"' for key in CUBE_KEYS)
+    sql = (
+        f"SELECT {keys}, COUNT(*) AS tasks,"
+        " TOTAL(delay) AS delay_sum, COUNT(delay) AS delay_n,"
+        " TOTAL(pct) AS pct_sum, COUNT(pct) AS pct_n,"
+        " TOTAL(budget) AS budget_sum, TOTAL(actual) AS actual_sum,"
+        " TOTAL(impact) AS impact_sum, COUNT(impact) AS impact_n"
+        " FROM (SELECT"
+        " COALESCE(t.Project_ID, 'Unknown') AS Project_ID,"
+        " COALESCE(p.Project_Name, 'Unknown') AS Project_Name,"
+        " COALESCE(d.Department_Name, 'Unknown') AS Department_Name,"
+        " COALESCE(t.Status, 'Unknown') AS Status,"
+        " t.Delay_Days AS delay, t.percent_complete AS pct,"
+        " COALESCE(c.Budgeted_Cost, 0) AS budget, COALESCE(c.Actual_Cost, 0) AS actual,"
+        # A task without a budget has no cost impact (NULL, not counted)
+        " (COALESCE(c.Actual_Cost, 0) - COALESCE(c.Budgeted_Cost, 0)) * 100.0"
+        " / NULLIF(COALESCE(c.Budgeted_Cost, 0), 0) AS impact"
+        + _JOINS
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + f") GROUP BY {keys}"
+    )
+    with closing(sqlite3.connect(DB_PATH)) as con:
+        cube = pd.read_sql_query(sql, con, params=params)
+    counts = {"tasks", "delay_n", "pct_n", "impact_n"}
+    cube = cube.astype({col: "int64" if col in counts else "float64" for col in MEASURES})
+    cube[CUBE_KEYS] = cube[CUBE_KEYS].astype(object)
+    return cube.set_index(CUBE_KEYS)[MEASURES]
+
+
+def query_last_updated(version):
+    """Latest Last_Updated across all tasks."""
+    ensure_database(version)
+    with closing(sqlite3.connect(DB_PATH)) as con:
+        latest = con.execute("SELECT MAX(Last_Updated) FROM tasks").fetchone()[0]
+    return pd.Timestamp(latest) if latest is not None else pd.NaT
+
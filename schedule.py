@@ -0,0 +1,306 @@
+"""Earned value and critical path over the task schedule.
+
+Like aggregates.py this is plain pandas/NumPy over the cleaned merged frame:
+`task_table` reduces it to one row per task, `critical_path` runs the CPM
+forward and backward passes over the task dependencies, and `earned_value`
+gives each project's PV, EV and AC curves with their SPI and CPI.
+"""
+import numpy as np
+import pandas as pd
+
+from profiling import profiled
+
+# Optional task column naming the Task_IDs a task waits for, separated by
+# commas or semicolons.
+# When no task lists any, dependencies are inferred (see infer_predecessors).
+PREDECESSORS_COLUMN = "Predecessors"
+
+# Merged columns the engine reads
+SCHEDULE_COLUMNS = [
+    'Task_Name', 'Project_Name', 'Status', 'Est_Start', 'Est_End', 'Act_Start', 'Act_End',
+    'percent_complete', 'Planned_Duration', 'Budgeted_Cost', 'Actual_Cost', 'Last_Updated',
+    PREDECESSORS_COLUMN,
+]
+
+_DAY = np.timedelta64(1, "D")
+_MAX_DAYS = 36_500
+_BLANK = {"", "nan", "None", "Unknown"}
+
+
+# --- Tasks ---
+def task_table(df):
+    """One row per task of a known project, with its duration, progress and costs.
+
+    The merged frame repeats a task once per cost row, so costs are summed.
+    Duration is the planned span in days, or Planned_Duration without dates.
+    """
+    df = df[df['Project_Name'].astype(str) != 'Unknown']
+    costs = df.groupby('Task_ID', observed=True, sort=False)[['Budgeted_Cost', 'Actual_Cost']].sum()
+    tasks = df.drop_duplicates('Task_ID').drop(columns=['Budgeted_Cost', 'Actual_Cost'])
+    tasks = tasks.join(costs, on='Task_ID').reset_index(drop=True)
+
+    span = (tasks['Est_End'] - tasks['Est_Start']) / _DAY
+    planned = tasks['Planned_Duration'] if 'Planned_Duration' in tasks.columns else np.nan
+    tasks['Duration'] = span.fillna(planned).clip(lower=0).fillna(0).astype(float)
+    tasks['Progress'] = (tasks['percent_complete'].astype(float) / 100).clip(0, 1).fillna(0)
+    tasks['BAC'] = tasks['Budgeted_Cost'].astype(float).fillna(0)
+    tasks['AC'] = tasks['Actual_Cost'].astype(float).fillna(0)
+    return tasks
+
+
+def status_date(tasks):
+    """Date progress is reported at: the latest Last_Updated, else today."""
+    latest = tasks['Last_Updated'].max() if 'Last_Updated' in tasks.columns else pd.NaT
+    return pd.Timestamp.today().normalize() if pd.isna(latest) else latest
+
+
+# --- Dependencies ---
+def listed_predecessors(tasks):
+    """(predecessor, successor) row positions from the Predecessors column."""
+    listed = tasks[PREDECESSORS_COLUMN].astype("string").str.split(r"[,;]", regex=True).explode().str.strip()
+    listed = listed[listed.notna() & ~listed.isin(_BLANK)]
+    pred = pd.Index(tasks['Task_ID'].astype(str)).get_indexer(listed)
+    succ = listed.index.to_numpy()
+    keep = (pred >= 0) & (pred != succ)
+    return pred[keep], succ[keep]
+
+
+def infer_predecessors(tasks):
+    """Finish-to-start links read off the plan, as row positions.
+
+    Each task waits for the task of its project that finishes last before it
+    starts; tasks overlapping all earlier work start with the project.
+    """
+    project = pd.factorize(tasks['Project_Name'])[0]
+    positions = np.arange(len(tasks))
+    starts = pd.DataFrame({'project': project, 'time': tasks['Est_Start'], 'succ': positions})
+    ends = pd.DataFrame({'project': project, 'time': tasks['Est_End'], 'pred': positions})
+    linked = pd.merge_asof(
+        starts.dropna(subset=['time']).sort_values('time'),
+        ends.dropna(subset=['time']).sort_values('time'),
+        on='time', by='project', allow_exact_matches=False,
+    ).dropna(subset=['pred'])
+    pred = linked['pred'].to_numpy(dtype=np.int64)
+    succ = linked['succ'].to_numpy(dtype=np.int64)
+    keep = pred != succ
+    return pred[keep], succ[keep]
+
+
+def dependency_edges(tasks):
+    """Listed predecessors when any task has them, else links inferred from the plan."""
+    if PREDECESSORS_COLUMN in tasks.columns:
+        pred, succ = listed_predecessors(tasks)
+        if len(pred):
+            return pred, succ, "listed"
+    pred, succ = infer_predecessors(tasks)
+    return pred, succ, "inferred"
+
+
+# --- Critical path ---
+# Levels at least this wide are scheduled with NumPy, narrower ones task by task
+_WIDE_LEVEL = 64
+
+
+def _adjacency(n, pred, succ):
+    """Successor lists as CSR offsets and targets, and in-degrees."""
+    order = np.argsort(pred, kind="stable")
+    offsets = np.searchsorted(pred[order], np.arange(n + 1))
+    return offsets, succ[order], np.bincount(succ, minlength=n)
+
+
+def _links_from(offsets, nodes):
+    """(source, link position) of every outgoing link of `nodes`."""
+    counts = offsets[nodes + 1] - offsets[nodes]
+    first = np.repeat(offsets[nodes] - (np.cumsum(counts) - counts), counts)
+    return np.repeat(nodes, counts), first + np.arange(counts.sum())
+
+
+def _forward_pass(offsets, targets, indegree, duration):
+    """Early starts, walking the tasks in dependency order.
+
+    Whole levels (tasks whose predecessors are all placed) go through NumPy
+    while they are wide; once a level narrows below _WIDE_LEVEL the rest runs
+    task by task (Kahn's algorithm), so a long chain costs no more than a
+    wide graph. Returns the starts, the levels and the task-by-task order;
+    tasks on a dependency cycle are in neither.
+    """
+    start = np.zeros(len(duration))
+    levels = []
+    frontier = np.flatnonzero(indegree == 0)
+    while len(frontier) >= _WIDE_LEVEL:
+        levels.append(frontier)
+        sources, links = _links_from(offsets, frontier)
+        reached = targets[links]
+        np.maximum.at(start, reached, start[sources] + duration[sources])
+        np.subtract.at(indegree, reached, 1)
+        frontier = np.unique(reached[indegree[reached] == 0])
+
+    offsets, targets, indegree = offsets.tolist(), targets.tolist(), indegree.tolist()
+    start, duration = start.tolist(), duration.tolist()
+    # `tail` doubles as the queue: tasks are appended as they become ready
+    tail = frontier.tolist()
+    for u in tail:
+        finish = start[u] + duration[u]
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if finish > start[v]:
+                start[v] = finish
+            indegree[v] -= 1
+            if not indegree[v]:
+                tail.append(v)
+    return np.array(start), levels, tail
+
+
+def _backward_pass(offsets, targets, duration, finish_by, levels, tail):
+    """Late finishes: the forward order in reverse, each task finishing by
+    `finish_by` and before any successor's late start."""
+    offsets_list, targets_list = offsets.tolist(), targets.tolist()
+    late_finish = finish_by.tolist()
+    late_start = (finish_by - duration).tolist()
+    for u in reversed(tail):
+        first, last = offsets_list[u], offsets_list[u + 1]
+        if first != last:
+            finish = min(late_finish[u], min([late_start[v] for v in targets_list[first:last]]))
+            late_finish[u] = finish
+            late_start[u] = finish - duration[u]
+
+    late_finish, late_start = np.array(late_finish), np.array(late_start)
+    for level in reversed(levels):
+        sources, links = _links_from(offsets, level)
+        np.minimum.at(late_finish, sources, late_start[targets[links]])
+        late_start[level] = late_finish[level] - duration[level]
+    return late_finish
+
+
+@profiled("schedule.critical_path", rows=len)
+def critical_path(tasks, edges=None):
+    """CPM schedule of every task: early/late start and finish, slack, critical flag.
+
+    A forward pass in dependency order gives the early dates and a backward
+    pass the late ones, both O(tasks + links). Times are days from the
+    project's first planned start; a project finishes when its last task
+    does. Tasks caught in a dependency cycle are left unscheduled (NaN).
+    """
+    n = len(tasks)
+    pred, succ = (edges if edges is not None else dependency_edges(tasks))[:2]
+    offsets, targets, indegree = _adjacency(n, np.asarray(pred, dtype=np.int64), np.asarray(succ, dtype=np.int64))
+    duration = tasks['Duration'].to_numpy(dtype=float)
+    start, levels, tail = _forward_pass(offsets, targets, indegree, duration)
+
+    scheduled = np.zeros(n, dtype=bool)
+    scheduled[np.concatenate(levels + [np.asarray(tail, dtype=np.int64)])] = True
+    es = np.where(scheduled, start, np.nan)
+    ef = es + duration
+    project = pd.factorize(tasks['Project_Name'])[0]
+    # Unscheduled tasks must not hold back their predecessors
+    finish_by = np.where(scheduled, pd.Series(ef).groupby(project).transform("max").to_numpy(), np.inf)
+    lf = np.where(scheduled, _backward_pass(offsets, targets, duration, finish_by, levels, tail), np.nan)
+    ls = lf - duration
+
+    project_start = tasks['Est_Start'].groupby(project).transform("min")
+    slack = ls - es
+    # Only a broken plan runs past a century; its dates are left blank
+    # rather than overflowing the datetime range
+    es_days = np.where(es <= _MAX_DAYS, es, np.nan)
+    ef_days = np.where(ef <= _MAX_DAYS, ef, np.nan)
+    return tasks[['Task_ID', 'Task_Name', 'Project_Name', 'Duration']].assign(
+        ES=es, EF=ef, LS=ls, LF=lf,
+        Slack=slack,
+        Critical=np.abs(np.nan_to_num(slack, nan=np.inf)) < 1e-9,
+        Early_Start=project_start + pd.to_timedelta(es_days, unit="D"),
+        Early_Finish=project_start + pd.to_timedelta(ef_days, unit="D"),
+    )
+
+
+def path_summary(path):
+    """Per project: network length in days and tasks on the critical path."""
+    return path.groupby('Project_Name', observed=True, sort=False).agg(
+        Critical_Path_Days=('EF', 'max'),
+        Critical_Tasks=('Critical', 'sum'),
+    ).reset_index()
+
+
+# --- Earned value ---
+def _ramps(groups, n_groups, starts, ends, amounts, grid):
+    """Sum over items of amount * clip((t - start) / (end - start), 0, 1) at each grid time.
+
+    A ramp is two hinge functions w * max(0, t - x) (slope up at its start,
+    down at its end), and a zero-length one a step. Each hinge or step is
+    binned to the first grid time at or after it; cumulative sums along the
+    grid then give the totals in O(items + groups * grid).
+    """
+    totals = np.zeros((n_groups, len(grid)))
+    ok = ~np.isnan(starts)
+    groups, starts, amounts = groups[ok], starts[ok], amounts[ok]
+    ends = np.maximum(np.where(np.isnan(ends[ok]), starts, ends[ok]), starts)
+    width = ends - starts
+    ramp = width > 0
+
+    weight = np.zeros((n_groups, len(grid) + 1))
+    weighted_x = np.zeros_like(weight)
+    step = np.zeros_like(weight)
+    slope = amounts[ramp] / width[ramp]
+    for x, w in ((starts[ramp], slope), (ends[ramp], -slope)):
+        k = np.searchsorted(grid, x, side="left")
+        np.add.at(weight, (groups[ramp], k), w)
+        np.add.at(weighted_x, (groups[ramp], k), w * x)
+    np.add.at(step, (groups[~ramp], np.searchsorted(grid, starts[~ramp], side="left")), amounts[~ramp])
+
+    totals += grid * np.cumsum(weight, axis=1)[:, :-1] - np.cumsum(weighted_x, axis=1)[:, :-1]
+    totals += np.cumsum(step, axis=1)[:, :-1]
+    return totals
+
+
+def _days(values, origin):
+    return ((pd.to_datetime(values) - origin) / _DAY).to_numpy(dtype=float, na_value=np.nan)
+
+
+@profiled("schedule.earned_value", rows=len)
+def earned_value(tasks, as_of, dates=None, freq="W"):
+    """PV, EV and AC of every project at each date, with SPI and CPI.
+
+    PV spreads each task's budget (BAC) evenly over its planned span. EV is
+    the budget times percent complete, earned evenly from the actual start
+    (planned start if not started) until the actual finish or `as_of`, and
+    AC spreads the actual cost the same way; the reported values are what
+    the tasks stand at on `as_of`. Dates default to every `freq` period of
+    the schedule, ending at `as_of`.
+    """
+    if dates is None:
+        first = tasks[['Est_Start', 'Act_Start']].min().min()
+        last = max(tasks['Est_End'].max(), as_of)
+        if pd.isna(first):
+            first = as_of
+        dates = pd.date_range(first, last, freq=freq).union([as_of])
+    dates = pd.DatetimeIndex(dates)
+    origin = dates[0]
+    grid = _days(dates, origin)
+
+    codes, projects = pd.factorize(tasks['Project_Name'])
+    est_start, est_end = _days(tasks['Est_Start'], origin), _days(tasks['Est_End'], origin)
+    act_start = _days(tasks['Act_Start'], origin)
+    cutoff = _days([as_of], origin)[0]
+    earned_from = np.where(np.isnan(act_start), est_start, act_start)
+    earned_from = np.where(np.isnan(earned_from), cutoff, np.minimum(earned_from, cutoff))
+    earned_to = np.minimum(np.nan_to_num(_days(tasks['Act_End'], origin), nan=cutoff), cutoff)
+
+    bac = tasks['BAC'].to_numpy(dtype=float)
+    planned = _ramps(codes, len(projects), est_start, est_end, bac, grid)
+    earned = _ramps(codes, len(projects), earned_from, earned_to, bac * tasks['Progress'].to_numpy(dtype=float), grid)
+    actual = _ramps(codes, len(projects), earned_from, earned_to, tasks['AC'].to_numpy(dtype=float), grid)
+
+    curves = pd.DataFrame({
+        'Project_Name': np.repeat(np.asarray(projects), len(dates)),
+        'Date': np.tile(dates, len(projects)),
+        'PV': planned.ravel(),
+        'EV': earned.ravel(),
+        'AC': actual.ravel(),
+    })
+    return with_indices(curves)
+
+
+def with_indices(values):
+    """Add SPI (EV / PV) and CPI (EV / AC), blank where the divisor is zero."""
+    return values.assign(
+        SPI=values['EV'] / values['PV'].where(values['PV'] > 0),
+        CPI=values['EV'] / values['AC'].where(values['AC'] > 0),
+    )
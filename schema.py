@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+# Declared layout of the four dashboard tables. Percent columns are stored
+# as text such as "45%"; numeric columns may arrive as text from CSVs.
+# Category columns are ids and low-cardinality text, held as categoricals
+# (integer codes) in the merged frame.
+TABLES = {
+    "projects": {
+        "csv": "projects.csv",
+        "id_column": "Project_ID",
+        "date_columns": ["Start_Date", "End_Date"],
+        "percent_columns": ["Project_Completion"],
+        "numeric_columns": [],
+        "category_columns": ["Project_ID", "Project_Name", "Location", "Status"],
+    },
+    "tasks": {
+        "csv": "tasks.csv",
+        "id_column": "Task_ID",
+        "date_columns": ["Est_Start", "Est_End", "Act_Start", "Act_End", "Last_Updated"],
+        "percent_columns": ["percent_complete"],
+        "numeric_columns": ["Delay_Days", "Planned_Duration", "Actual_Duration"],
+        "category_columns": ["Task_ID", "Project_ID", "Department_ID", "Assigned_To", "Priority", "Status"],
+    },
+    "costs": {
+        "csv": "costs.csv",
+        "id_column": "Cost_ID",
+        "date_columns": [],
+        "percent_columns": [],
+        "numeric_columns": [
+            "Budgeted_Cost", "Actual_Cost", "Hours_Allocated",
+            "Hours_Worked", "Cost_of_Hours_Worked", "Variance",
+        ],
+        "category_columns": ["Cost_ID", "Task_ID"],
+    },
+    "departments": {
+        "csv": "departments.csv",
+        "id_column": "Department_ID",
+        "date_columns": [],
+        "percent_columns": [],
+        "numeric_columns": [],
+        "category_columns": ["Department_ID", "Department_Name", "Manager"],
+    },
+}
+
+
+# (table, column, referenced table): the column holds ids of the referenced
+# table's id_column. Blank values reference nothing.
+FOREIGN_KEYS = [
+    ("tasks", "Project_ID", "projects"),
+    ("tasks", "Department_ID", "departments"),
+    ("costs", "Task_ID", "tasks"),
+]
+
+
+# Accepted date layouts, tried in order after '/' is folded into '-'.
+# Two-digit years go first: '%Y' would otherwise read "31-Mar-25" as year 25.
+DATE_FORMATS = ["%d-%b-%y", "%d-%m-%y", "%d-%b-%Y", "%d-%m-%Y", "%d-%B-%Y", "ISO8601"]
+
+_MISSING_DATES = {"", "nan", "NaN", "NaT", "None", "<NA>"}
+
+
+def parse_dates(series):
+    """Parse a day-first date column against DATE_FORMATS.
+
+    Each distinct value is parsed once with an explicit format, so large
+    columns never fall back to per-element inference. Values matching no
+    format become NaT (see `date_failures`).
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype("datetime64[ns]").dt.normalize()
+
+    text = series.astype("string").str.strip().str.replace("/", "-", regex=False)
+    text = text.mask(text.isin(_MISSING_DATES))
+    uniques = pd.Series(text.dropna().unique(), dtype="string")
+    if uniques.empty:
+        return pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        todo = parsed.isna()
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(uniques[todo], format=fmt, errors="coerce")
+
+    lookup = pd.Series(parsed.dt.normalize().values, index=uniques.values)
+    return pd.Series(text.map(lookup).values, index=series.index, dtype="datetime64[ns]")
+
+
+def date_failures(raw, parsed, table):
+    """Rows whose non-empty date text could not be parsed."""
+    id_column = TABLES[table]["id_column"]
+    failures = []
+    for col in TABLES[table]["date_columns"]:
+        if col not in raw.columns:
+            continue
+        text = raw[col].astype("string").str.strip()
+        failed = text.notna() & ~text.isin(_MISSING_DATES) & parsed[col].isna()
+        if failed.any():
+            failures.append(pd.DataFrame({
+                id_column: raw.loc[failed, id_column].astype(str) if id_column in raw.columns else "",
+                "Column": col,
+                "Value": text[failed],
+            }))
+    if not failures:
+        return pd.DataFrame(columns=[id_column, "Column", "Value"])
+    return pd.concat(failures, ignore_index=True)
+
+
+# Task dates bounding when a task is active, for date-range filters
+SPAN_COLUMNS = ["Est_Start", "Est_End", "Act_Start", "Act_End"]
+
+
+def task_spans(df):
+    """Earliest and latest of each task's estimated and actual dates."""
+    dates = df[[col for col in SPAN_COLUMNS if col in df.columns]]
+    return dates.min(axis=1), dates.max(axis=1)
+
+
+def normalize_dates(df, table):
+    """Parse every declared date column of `table` present in `df`.
+
+    Returns the typed frame and the rows that failed to parse.
+    """
+    raw = df
+    df = df.copy()
+    for col in TABLES[table]["date_columns"]:
+        if col in df.columns:
+            df[col] = parse_dates(df[col])
+    return df, date_failures(raw, df, table)
+
+
+def _parse_numbers(values):
+    """Float array from number or percent text; each distinct value parsed once."""
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype="string").str.strip().str.rstrip("%").str.strip()
+    parsed = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    # Missing values have code -1, which picks the trailing NaN
+    return np.append(parsed, np.nan)[codes]
+
+
+def parse_numbers(series):
+    """Numbers from values such as "45%", " 45 %", "1200" or 45, as float64."""
+    if series.dtype.kind in "biuf":
+        return series.astype(float)
+    return pd.Series(_parse_numbers(series), index=series.index)
+
+
+def coerce_numbers(df, columns):
+    """Parse every text column of `columns` in one pass, in place.
+
+    The text columns are stacked into one array so the strip and
+    to_numeric run once for all of them. Columns already numeric are kept.
+    """
+    text_columns = [col for col in columns if col in df.columns and df[col].dtype.kind not in "biuf"]
+    if not text_columns:
+        return df
+    stacked = np.concatenate([df[col].astype(object).to_numpy() for col in text_columns])
+    numbers = _parse_numbers(stacked).reshape(len(text_columns), len(df))
+    for col, values in zip(text_columns, numbers):
+        df[col] = values
+    return df
+
+
+def format_percents(values):
+    """Percent numbers as the stored text form, e.g. 45.0 -> "45%"."""
+    text = values.round(2).astype("string").str.removesuffix(".0") + "%"
+    return text.where(values.notna())
+
+
+def compact_dtypes(df, table):
+    """Load-time typing for the merged frame: categorical ids and labels,
+    float64 numbers and float32 percents."""
+    spec = TABLES[table]
+    for col in spec["category_columns"]:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    coerce_numbers(df, spec["percent_columns"] + spec["numeric_columns"])
+    for col in spec["percent_columns"]:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    return df
+
+
+# Merged columns the pages show as 0 when blank
+FILL_ZERO_COLUMNS = TABLES["tasks"]["numeric_columns"] + TABLES["costs"]["numeric_columns"]
+# Every column parsed as a number, by its merged name
+NUMBER_COLUMNS = [
+    "percent_complete", "Project_Completion",
+] + FILL_ZERO_COLUMNS
@@ -0,0 +1,188 @@
+"""Page views precomputed off the request path, published as snapshot files.
+
+A daemon thread polls the stored tables and, whenever their version
+changes, recomputes the portfolio views (see analytics.py) for the date
+ranges the pages have asked for. The result is pickled to SNAPSHOT_DIR
+under the data version and swapped in with os.replace, so a reader sees
+a whole snapshot or none. The pages call the wrappers below, which serve
+the snapshot of the current data version and only compute inline when
+it is not published yet (first start, or an edit the worker has not
+caught up with). Views of a single project are always computed on request:
+each reads only that project's rows, while precomputing them all would
+cost projects x ranges full passes per edit.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+import traceback
+
+import analytics
+from data import sources_signature
+from profiling import start_run, stage
+from store import STORE_DIR
+
+SNAPSHOT_DIR = os.path.join(STORE_DIR, "snapshots")
+# Set DASHBOARD_SNAPSHOTS=0 to compute every view inline
+ENABLED = os.environ.get("DASHBOARD_SNAPSHOTS", "1") != "0"
+POLL_SECONDS = float(os.environ.get("DASHBOARD_SNAPSHOT_POLL", "2"))
+# Date ranges precomputed per data version, most recently requested kept
+MAX_RANGES = 8
+# Snapshot files kept on disk; older versions are deleted after a publish
+KEEP_SNAPSHOTS = 2
+
+_lock = threading.Lock()
+_ranges = {(None, None): True}
+_loaded = {}
+_worker = None
+
+
+def snapshot_path(signature):
+    version = hashlib.sha1(repr(signature).encode()).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, f"{version}.pkl")
+
+
+def _want(start, end):
+    """Remember a date range the pages asked for, for the next build."""
+    with _lock:
+        if (start, end) in _ranges:
+            return
+        _ranges[(start, end)] = True
+        while len(_ranges) > MAX_RANGES:
+            del _ranges[next(iter(_ranges))]
+
+
+def wanted_ranges():
+    with _lock:
+        return list(_ranges)
+
+
+# --- Building ---
+def build_views(ranges):
+    """The portfolio views the pages show, for each (start, end) range."""
+    views = {("schedule",): analytics.schedule_view()}
+    for start, end in ranges:
+        views[("options", start, end)] = analytics.options(start, end)
+        views[("home", start, end)] = analytics.home_view(start, end)
+        views[("timeline", None, None, start, end, "Auto")] = analytics.timeline(start=start, end=end)
+        views[("comparison", start, end)] = analytics.project_comparison(start, end)
+    return views
+
+
+def publish():
+    """Build and write the snapshot of the current data version.
+
+    Returns its path, or None when the data changed during the build (the
+    next poll builds again).
+    """
+    signature = sources_signature()
+    ranges = wanted_ranges()
+    views = build_views(ranges)
+    if sources_signature() != signature:
+        return None
+
+    snapshot = {"signature": signature, "ranges": ranges, "built": time.time(), "views": views}
+    path = snapshot_path(signature)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    with _lock:
+        _loaded.clear()
+        _loaded[path] = (os.stat(path).st_mtime_ns, snapshot)
+    _prune()
+    return path
+
+
+def _prune():
+    names = [name for name in os.listdir(SNAPSHOT_DIR) if name.endswith(".pkl")]
+    paths = sorted((os.path.join(SNAPSHOT_DIR, name) for name in names), key=os.path.getmtime)
+    for path in paths[:-KEEP_SNAPSHOTS]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# --- Worker ---
+def _run(poll):
+    published = None
+    while True:
+        # The worker's stages would otherwise pile up in its thread's records
+        start_run()
+        try:
+            state = (sources_signature(), tuple(wanted_ranges()))
+            if state != published and publish() is not None:
+                published = state
+        except Exception:
+            traceback.print_exc()
+        time.sleep(poll)
+
+
+def start_worker(poll=POLL_SECONDS):
+    """Start the precompute thread once per server process."""
+    global _worker
+    with _lock:
+        if _worker is None and ENABLED:
+            _worker = threading.Thread(target=_run, args=(poll,), name="snapshot-worker", daemon=True)
+            _worker.start()
+
+
+# --- Reading ---
+def current_snapshot():
+    """Published snapshot of the current data version, or None."""
+    path = snapshot_path(sources_signature())
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _lock:
+        loaded = _loaded.get(path)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+    with open(path, "rb") as f:
+        snapshot = pickle.load(f)
+    with _lock:
+        _loaded.clear()
+        _loaded[path] = (mtime, snapshot)
+    return snapshot
+
+
+def _view(key, compute, start, end):
+    _want(start, end)
+    if ENABLED:
+        with stage("snapshot.read"):
+            snapshot = current_snapshot()
+        if snapshot is not None and key in snapshot["views"]:
+            return snapshot["views"][key]
+    return compute()
+
+
+def options(start=None, end=None):
+    return _view(("options", start, end), lambda: analytics.options(start, end), start, end)
+
+
+def home_view(start=None, end=None):
+    return _view(("home", start, end), lambda: analytics.home_view(start, end), start, end)
+
+
+def project_view(project, start=None, end=None):
+    # Not in the snapshot (see the module docstring)
+    _want(start, end)
+    return analytics.project_view(project, start, end)
+
+
+def project_comparison(start=None, end=None):
+    key = ("comparison", start, end)
+    return _view(key, lambda: analytics.project_comparison(start, end), start, end)
+
+
+def schedule_view():
+    return _view(("schedule",), analytics.schedule_view, None, None)
+
+
+def timeline(project=None, department=None, start=None, end=None, detail="Auto"):
+    key = ("timeline", project, department, start, end, detail)
+    return _view(key, lambda: analytics.timeline(project, department, start, end, detail), start, end)
@@ -0,0 +1,518 @@
+import json
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from schema import FOREIGN_KEYS, TABLES, normalize_dates
+
+# Typed Parquet copies of the CSV tables live here
+STORE_DIR = ".store"
+
+# Parquet metadata keys: which CSV version a file was built from, the date
+# values that failed to parse when it was written, and for a compacted base
+# the base version and segments it was folded from
+_SOURCE_KEY = b"source_csv"
+_DATE_FAILURES_KEY = b"date_failures"
+_COMPACTED_KEY = b"compacted_from"
+_CSV_DATE_FORMAT = "%d-%b-%Y"
+
+# --- Change log ---
+# Saves append a small Parquet segment holding only the changed rows. Reads
+# replay the segments over the base file, and once COMPACT_AFTER segments
+# pile up a background thread folds them into the base and the CSV.
+COMPACT_AFTER = 16
+_OP_COLUMN = "_op"
+
+_write_lock = threading.RLock()
+_compacting = set()
+
+
+def table_path(table):
+    return os.path.join(STORE_DIR, f"{table}.parquet")
+
+
+def log_dir(table):
+    return os.path.join(STORE_DIR, f"{table}.log")
+
+
+def _segments(table):
+    try:
+        names = os.listdir(log_dir(table))
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names if name.endswith(".parquet"))
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _csv_signature(table):
+    return _file_signature(TABLES[table]["csv"])
+
+
+def _base_version(table):
+    signatures = (_csv_signature(table), _file_signature(table_path(table)))
+    return json.dumps(signatures, sort_keys=True)
+
+
+def table_version(table):
+    """Changes whenever the stored contents of `table` may have changed."""
+    return _base_version(table), tuple(_segments(table))
+
+
+def _read_metadata(path, key):
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except FileNotFoundError:
+        return None
+    raw = metadata.get(key)
+    return json.loads(raw) if raw else None
+
+
+def _stored_metadata(table, key):
+    return _read_metadata(table_path(table), key)
+
+
+def _coerce(df, table):
+    """Bring edited values (strings from the editor) back to storable types."""
+    df, failures = normalize_dates(df, table)
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        blank = df[col].isna() | (df[col].astype(str).str.strip() == "")
+        values = df[col].mask(blank)
+        as_numbers = pd.to_numeric(values, errors="coerce")
+        if as_numbers.notna().sum() == (~blank).sum():
+            df[col] = as_numbers
+        else:
+            df[col] = values.where(blank, values.astype(str))
+    return df, failures
+
+
+def _stage_parquet(path, df, metadata_values):
+    """Write `df` beside `path`; returns the temporary file to swap in."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(arrow_table.schema.metadata or {})
+    for key, value in metadata_values.items():
+        metadata[key] = value.encode()
+    arrow_table = arrow_table.replace_schema_metadata(metadata)
+
+    tmp_path = f"{path}.tmp"
+    pq.write_table(arrow_table, tmp_path)
+    return tmp_path
+
+
+def _write_parquet(path, df, metadata_values):
+    # Write beside the target and swap in, so readers never see a partial file
+    os.replace(_stage_parquet(path, df, metadata_values), path)
+
+
+def _write_base(table, df, failures, source=None, compacted_from=None):
+    """Swap in the base file of `table`, built from the CSV version `source`."""
+    if source is None:
+        source = _csv_signature(table)
+    metadata = {
+        _SOURCE_KEY: json.dumps(source),
+        _DATE_FAILURES_KEY: failures.to_json(orient="records"),
+    }
+    if compacted_from is not None:
+        metadata[_COMPACTED_KEY] = json.dumps(compacted_from)
+    _write_parquet(table_path(table), df, metadata)
+
+
+def import_csv(table):
+    """Rebuild the Parquet copy of `table` from its CSV, parsing dates once."""
+    # Stamp the version that was read, so a CSV changed during the read is
+    # imported again on the next sync
+    source = _csv_signature(table)
+    # The pyarrow parser is multithreaded and releases the GIL
+    df = pd.read_csv(TABLES[table]["csv"], engine="pyarrow")
+    df, failures = normalize_dates(df, table)
+    with _write_lock:
+        _write_base(table, df, failures, source)
+    return df
+
+
+def export_csv(table, df=None):
+    """Write `table` back to its CSV so other tools keep working."""
+    if df is None:
+        df = read_table(table)
+    # Write beside the CSV and swap in: a reader or a crash never sees half a file
+    path = TABLES[table]["csv"]
+    tmp_path = f"{path}.tmp"
+    df.to_csv(tmp_path, index=False, date_format=_CSV_DATE_FORMAT)
+    os.replace(tmp_path, path)
+
+
+def _stale(table):
+    return _stored_metadata(table, _SOURCE_KEY) != _csv_signature(table)
+
+
+def sync(table):
+    """Re-import `table` if its CSV changed since the Parquet copy was built."""
+    _recover_batch()
+    if not _stale(table):
+        return
+    with _write_lock:
+        # A compaction swaps in the CSV before the base it was written from;
+        # once it has released the lock the two agree again
+        if _stale(table):
+            import_csv(table)
+
+
+def table_dtypes(table):
+    """Column dtypes of the stored `table`, read from its schema alone."""
+    sync(table)
+    return pq.read_schema(table_path(table)).empty_table().to_pandas().dtypes
+
+
+def _read_log(table, segments, columns=None):
+    frames = []
+    for name in segments:
+        path = os.path.join(log_dir(table), name)
+        try:
+            if columns is not None:
+                available = pq.read_schema(path).names
+                frames.append(pd.read_parquet(path, columns=[c for c in columns if c in available]))
+            else:
+                frames.append(pd.read_parquet(path))
+        except FileNotFoundError:
+            # Compacted while we were reading; the base already holds it
+            continue
+    return frames
+
+
+def _replay(base, log_frames, id_column):
+    """Apply logged upserts and deletes over `base`, last write wins."""
+    if not log_frames:
+        return base
+    log = pd.concat(log_frames, ignore_index=True)
+    log = log.drop_duplicates(subset=id_column, keep="last")
+    base = base[~base[id_column].astype(str).isin(log[id_column].astype(str))]
+    upserts = log[log[_OP_COLUMN] == "upsert"].drop(columns=_OP_COLUMN)
+    if upserts.empty:
+        return base.reset_index(drop=True)
+    if base.empty:
+        return upserts.reset_index(drop=True)
+    return pd.concat([base, upserts], ignore_index=True)
+
+
+def read_table(table, columns=None):
+    """Load a typed table, reading only `columns` when given."""
+    sync(table)
+    id_column = TABLES[table]["id_column"]
+    # List the log before reading the base: a compaction in between only
+    # leaves us replaying segments the new base already contains.
+    segments = _segments(table)
+    if columns is not None:
+        available = pq.read_schema(table_path(table)).names
+        columns = [col for col in columns if col in available]
+        if segments and id_column not in columns:
+            base = pd.read_parquet(table_path(table), columns=[id_column] + columns)
+            log_frames = _read_log(table, segments, [id_column, _OP_COLUMN] + columns)
+            return _replay(base, log_frames, id_column)[columns]
+    base = pd.read_parquet(table_path(table), columns=columns)
+    log_columns = None if columns is None else [_OP_COLUMN] + columns
+    return _replay(base, _read_log(table, segments, log_columns), id_column)
+
+
+def changed_rows(table, df):
+    """Rows of `df` that are new or differ from what is stored."""
+    df, _ = _coerce(df, table)
+    id_column = TABLES[table]["id_column"]
+    stored = read_table(table)
+    stored.index = stored[id_column].astype(str)
+    stored = stored[~stored.index.duplicated(keep="last")]
+
+    ids = df[id_column].astype(str)
+    known = ids.isin(stored.index).to_numpy()
+    columns = [col for col in df.columns if col in stored.columns]
+    before = stored.loc[ids[known], columns].reset_index(drop=True)
+    after = df.loc[known, columns].reset_index(drop=True)
+    same = ((before == after) | (before.isna() & after.isna())).all(axis=1).to_numpy()
+
+    changed = ~known
+    changed[known] = ~same
+    if len(columns) < len(df.columns):
+        changed[:] = True
+    return df[changed]
+
+
+def _segment(table, upserts=None, deletes=()):
+    """Log segment recording `upserts` and `deletes`, and its date failures."""
+    id_column = TABLES[table]["id_column"]
+    parts = []
+    failures = pd.DataFrame(columns=[id_column, "Column", "Value"])
+    if upserts is not None and len(upserts):
+        upserts, failures = _coerce(upserts, table)
+        parts.append(upserts.assign(**{_OP_COLUMN: "upsert"}))
+    if len(deletes):
+        parts.append(pd.DataFrame({id_column: [str(i) for i in deletes], _OP_COLUMN: "delete"}))
+    if not parts:
+        return None, failures
+    return (pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]), failures
+
+
+def _next_segment_path(table):
+    existing = _segments(table)
+    sequence = int(existing[-1].split(".")[0]) + 1 if existing else 1
+    return os.path.join(log_dir(table), f"{sequence:08d}.parquet")
+
+
+def _compact_if_due(table):
+    if len(_segments(table)) >= COMPACT_AFTER and table not in _compacting:
+        _compacting.add(table)
+        threading.Thread(target=_compact_in_background, args=(table,), daemon=True).start()
+
+
+# --- Batched saves ---
+# A batch maps table names to {"upserts": DataFrame, "deletes": [ids]}. It is
+# checked against FOREIGN_KEYS as a whole and written as one segment per
+# table. The segments are staged first and a journal listing them is swapped
+# in before any of them is published, so after a crash the next read finishes
+# the batch instead of seeing only part of it.
+_BATCH_JOURNAL = os.path.join(STORE_DIR, "batch.json")
+
+
+def stage(batch, table, upserts=None, deletes=()):
+    """Add edits of `table` to `batch`; later upserts of an id replace earlier ones."""
+    entry = batch.setdefault(table, {"upserts": None, "deletes": []})
+    if upserts is not None and len(upserts):
+        id_column = TABLES[table]["id_column"]
+        if entry["upserts"] is not None:
+            upserts = pd.concat([entry["upserts"], upserts], ignore_index=True)
+        ids = upserts[id_column].astype(str)
+        entry["upserts"] = upserts[~ids.duplicated(keep="last")].reset_index(drop=True)
+    entry["deletes"] = list(entry["deletes"]) + [str(i) for i in deletes]
+    return batch
+
+
+def _batch_ids(batch, table):
+    """Ids `table` will hold once `batch` is applied, as a hash index."""
+    id_column = TABLES[table]["id_column"]
+    ids = pd.Index(read_table(table, columns=[id_column])[id_column].astype(str))
+    entry = batch.get(table) or {}
+    upserts = entry.get("upserts")
+    if upserts is not None and len(upserts):
+        ids = ids.union(pd.Index(upserts[id_column].astype(str)))
+    return ids.difference(pd.Index(entry.get("deletes") or [], dtype=object))
+
+
+def _blank(values):
+    return values.isna() | values.astype(str).str.strip().isin(["", "nan", "None"])
+
+
+def check_references(batch):
+    """Rows the batch would leave pointing at ids that do not exist.
+
+    Checks the upserted rows of every referencing table, and the stored rows
+    that reference an id the batch deletes. Returns one row per broken
+    reference (empty when the batch is consistent).
+    """
+    violations = []
+    for table, column, referenced in FOREIGN_KEYS:
+        id_column = TABLES[table]["id_column"]
+        entry = batch.get(table) or {}
+        deleted = pd.Index(entry.get("deletes") or [], dtype=object)
+        candidates = []
+
+        upserts = entry.get("upserts")
+        if upserts is not None and len(upserts) and column in upserts.columns:
+            rows = upserts[[id_column, column]].astype(object)
+            candidates.append(rows[~rows[id_column].astype(str).isin(deleted)])
+
+        removed = (batch.get(referenced) or {}).get("deletes") or []
+        if removed:
+            stored = read_table(table, columns=[id_column, column])
+            stored = stored[stored[column].astype(str).isin(pd.Index(removed, dtype=object))]
+            rewritten = deleted
+            if upserts is not None and len(upserts):
+                rewritten = rewritten.union(pd.Index(upserts[id_column].astype(str)))
+            candidates.append(stored[~stored[id_column].astype(str).isin(rewritten)].astype(object))
+
+        candidates = [rows for rows in candidates if len(rows)]
+        if not candidates:
+            continue
+        rows = pd.concat(candidates, ignore_index=True)
+        rows = rows[~_blank(rows[column])]
+        broken = ~rows[column].astype(str).isin(_batch_ids(batch, referenced))
+        if broken.any():
+            violations.append(pd.DataFrame({
+                "Table": table,
+                "ID": rows.loc[broken, id_column].astype(str),
+                "Column": column,
+                "Value": rows.loc[broken, column].astype(str),
+                "References": referenced,
+            }))
+    if not violations:
+        return pd.DataFrame(columns=["Table", "ID", "Column", "Value", "References"])
+    return pd.concat(violations, ignore_index=True)
+
+
+def _recover_batch():
+    """Publish the segments of a batch that was interrupted mid-commit."""
+    if not os.path.exists(_BATCH_JOURNAL):
+        return
+    with _write_lock:
+        try:
+            with open(_BATCH_JOURNAL, encoding="utf-8") as journal:
+                moves = json.load(journal)
+        except FileNotFoundError:
+            return
+        for tmp_path, path in moves:
+            if os.path.exists(tmp_path):
+                os.replace(tmp_path, path)
+        os.remove(_BATCH_JOURNAL)
+
+
+def _drop_broken(batch, violations):
+    """`batch` without the upserted rows named in `violations`.
+
+    Returns the reduced batch and the tables rows were dropped from, or
+    (None, None) when a violation is a stored row referencing an id the
+    batch deletes, which dropping upserts cannot fix.
+    """
+    batch = dict(batch)
+    for table, ids in violations.groupby("Table")["ID"]:
+        entry = batch.get(table) or {}
+        upserts = entry.get("upserts")
+        if upserts is None:
+            return None, None
+        upserted = upserts[TABLES[table]["id_column"]].astype(str)
+        if not ids.isin(upserted).all():
+            return None, None
+        batch[table] = dict(entry, upserts=upserts[~upserted.isin(ids)].reset_index(drop=True))
+    return batch, set(violations["Table"])
+
+
+def commit_batch(batch, drop_broken=False):
+    """Validate `batch` and record the edits of all its tables together.
+
+    Nothing is written when a foreign key would break; the violations are
+    returned instead (see `check_references`). Returns an empty frame once
+    the batch is committed. With `drop_broken` the upserted rows that break
+    a reference are left out and the rest is committed; their violations
+    are still returned.
+    """
+    segments = {}
+    for table, entry in batch.items():
+        segment, failures = _segment(table, entry.get("upserts"), entry.get("deletes") or ())
+        if segment is not None:
+            segments[table] = (segment, failures)
+
+    with _write_lock:
+        violations = check_references(batch)
+        rejected = []
+        while len(violations) and drop_broken:
+            batch, dropped = _drop_broken(batch, violations)
+            if batch is None:
+                return pd.concat(rejected + [violations], ignore_index=True)
+            rejected.append(violations)
+            for table in dropped:
+                entry = batch[table]
+                segment, failures = _segment(table, entry["upserts"], entry.get("deletes") or ())
+                segments.pop(table, None)
+                if segment is not None:
+                    segments[table] = (segment, failures)
+            # Only upserts referencing a table that lost rows can break anew
+            if any(table in batch and referenced in dropped for table, _, referenced in FOREIGN_KEYS):
+                violations = check_references(batch)
+            else:
+                violations = violations.iloc[:0]
+        if rejected:
+            violations = pd.concat(rejected, ignore_index=True)
+        elif len(violations):
+            return violations
+        if not segments:
+            return violations
+
+        moves = []
+        for table, (segment, failures) in segments.items():
+            sync(table)
+            path = _next_segment_path(table)
+            metadata = {_DATE_FAILURES_KEY: failures.to_json(orient="records")}
+            moves.append((_stage_parquet(path, segment, metadata), path))
+
+        journal_tmp = f"{_BATCH_JOURNAL}.tmp"
+        with open(journal_tmp, "w", encoding="utf-8") as journal:
+            json.dump(moves, journal)
+        os.replace(journal_tmp, _BATCH_JOURNAL)
+        _recover_batch()
+
+        for table in segments:
+            _compact_if_due(table)
+    return violations
+
+
+def _compact_in_background(table):
+    try:
+        compact(table)
+    finally:
+        with _write_lock:
+            _compacting.discard(table)
+
+
+def compact(table):
+    """Fold the change log of `table` into its base file and CSV."""
+    with _write_lock:
+        segments = _segments(table)
+        if not segments:
+            return
+        df = read_table(table)
+        failures = date_failures(table)
+        compacted_from = [_base_version(table), segments]
+        export_csv(table, df)
+        _write_base(table, df, failures, compacted_from=compacted_from)
+        for name in segments:
+            os.remove(os.path.join(log_dir(table), name))
+
+
+def date_failures(table):
+    """Date values of `table` that matched none of the accepted formats."""
+    sync(table)
+    id_column = TABLES[table]["id_column"]
+    base = pd.DataFrame(_stored_metadata(table, _DATE_FAILURES_KEY) or [])
+    frames = [base]
+    for name in _segments(table):
+        path = os.path.join(log_dir(table), name)
+        logged = pd.read_parquet(path, columns=[id_column])[id_column].astype(str)
+        # Rows rewritten by a later commit replace their earlier failures
+        frames = [f[~f[id_column].astype(str).isin(logged)] if len(f) else f for f in frames]
+        frames.append(pd.DataFrame(_read_metadata(path, _DATE_FAILURES_KEY) or []))
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame(columns=[id_column, "Column", "Value"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def changes_since(table, position):
+    """What a copy of `table` must apply to catch up with the store.
+
+    `position` is what an earlier call returned (None for an empty copy).
+    Returns the new position and either the whole table, when the copy has
+    to be reloaded (a first load, or a base rewritten from an edited CSV),
+    or the change-log segments logged since, to replay in order with
+    last-write-wins semantics. A compaction of segments the copy has
+    already applied needs neither. Runs under the write lock, so the
+    position always matches what was read.
+    """
+    with _write_lock:
+        sync(table)
+        base, segments = _base_version(table), _segments(table)
+        current = [base, segments]
+        if position is not None:
+            seen_base, seen = position
+            if seen_base != base and _stored_metadata(table, _COMPACTED_KEY) == [seen_base, seen]:
+                seen_base, seen = base, []
+            if seen_base == base and segments[:len(seen)] == seen:
+                return current, None, _read_log(table, segments[len(seen):])
+        return current, read_table(table), None
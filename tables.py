@@ -1,25 +1,112 @@
+import threading
+
 import pandas as pd
 import streamlit as st
 from streamlit_extras.dataframe_explorer import dataframe_explorer
+from data import refresh_after_batch, sources_signature
+from ingest import LOAD_ORDER, ingest, table_for
+from schema import TABLES
+from store import changed_rows, commit_batch, read_table, stage, table_version
+
+# --- Paginated mode ---
+# The loaded table per version, with sort orders and lower-cased search text
+# built on first use, shared by every session. Filtering and sorting run
+# here and only the visible page is sent to the browser.
+_page_index = {}
+_page_index_lock = threading.Lock()
+
+_ALL_COLUMNS = "All columns"
+
+
+def _table_index(table, columns):
+    key = (table, tuple(columns) if columns else None)
+    version = table_version(table)
+    with _page_index_lock:
+        entry = _page_index.get(key)
+        if entry is None or entry["version"] != version:
+            df = read_table(table, columns=columns).reset_index(drop=True)
+            entry = {"version": version, "df": df, "order": {}, "text": {}}
+            _page_index[key] = entry
+    return entry
+
+
+def _sort_order(entry, column, ascending):
+    """Row positions of the table sorted on `column`, blanks last."""
+    key = (column, ascending)
+    with _page_index_lock:
+        order = entry["order"].get(key)
+        if order is None:
+            values = entry["df"][column]
+            try:
+                ordered = values.sort_values(ascending=ascending, kind="stable", na_position="last")
+            except TypeError:
+                ordered = values.astype(str).sort_values(ascending=ascending, kind="stable")
+            order = ordered.index.to_numpy()
+            entry["order"][key] = order
+    return order
+
+
+def _search_mask(entry, column, text):
+    text = text.strip().lower()
+    df = entry["df"]
+    if not text:
+        return None
+    mask = pd.Series(False, index=df.index)
+    for col in (df.columns if column == _ALL_COLUMNS else [column]):
+        with _page_index_lock:
+            lowered = entry["text"].get(col)
+            if lowered is None:
+                lowered = df[col].astype(str).str.lower()
+                entry["text"][col] = lowered
+        mask |= lowered.str.contains(text, regex=False)
+    return mask.to_numpy()
+
+
+def _paginated_view(table, key_prefix, columns, page_size):
+    """The full table and the one page of it selected by the page controls."""
+    entry = _table_index(table, columns)
+    df = entry["df"]
+
+    search_col, text_col, sort_col, order_col = st.columns([2, 3, 2, 1])
+    search_in = search_col.selectbox(
+        "Search in", [_ALL_COLUMNS] + list(df.columns), key=f"{key_prefix}_search_in"
+    )
+    search = text_col.text_input("Contains", key=f"{key_prefix}_search")
+    sort_by = sort_col.selectbox("Sort by", list(df.columns), key=f"{key_prefix}_sort_by")
+    ascending = order_col.radio("Order", ["▲", "▼"], key=f"{key_prefix}_order") == "▲"
+
+    positions = _sort_order(entry, sort_by, ascending)
+    mask = _search_mask(entry, search_in, search)
+    if mask is not None:
+        positions = positions[mask[positions]]
+
+    pages = max(1, -(-len(positions) // page_size))
+    page = st.number_input(
+        f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=f"{key_prefix}_page"
+    )
+    first = (page - 1) * page_size
+    st.caption(f"Rows {min(first + 1, len(positions)):,}–{min(first + page_size, len(positions)):,} of {len(positions):,}")
+    return df, df.iloc[positions[first:first + page_size]].reset_index(drop=True)
+
 
 def render_table_editor(
-    file_path,
+    table,
     key_prefix,
     id_column,
     date_columns=None,
-    editable_columns=None
+    editable_columns=None,
+    page_size=None
 ):
-    # Load data
-    df = pd.read_csv(file_path)
-
-    # Explicitly parse date columns
-    if date_columns:
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], dayfirst=True, errors="coerce")
+    # Load data (dates come back typed; only the editable columns when given)
+    columns = [id_column] + list(editable_columns) if editable_columns else None
+    if page_size:
+        # Filter, sort and page server-side; only one page is rendered
+        df, filtered_df = _paginated_view(table, key_prefix, columns, page_size)
+    else:
+        df = read_table(table, columns=columns)
 
-    # Add filter
-    filtered_df = dataframe_explorer(df, case=False)
+        # Add filter
+        filtered_df = dataframe_explorer(df, case=False)
 
     # Init session state for new rows
     if f"{key_prefix}_added_rows" not in st.session_state:
@@ -60,25 +147,102 @@ def render_table_editor(
             st.error(f"❌ One or more rows have an empty {id_column}.")
         elif edited_df[id_column].astype(str).duplicated().any():
             st.error(f"❌ Duplicate {id_column}s found.")
+        elif edited_df[id_column].astype(str).isin(
+            set(df[id_column].astype(str)) - set(filtered_df[id_column].astype(str))
+        ).any():
+            # Only the shown rows are edited; the rest keep their ids
+            st.error(f"❌ A {id_column} is already used by a row that is not shown.")
         else:
-            old_df = pd.read_csv(file_path)
-            if date_columns:
-                for col in date_columns:
-                    if col in old_df.columns:
-                        old_df[col] = pd.to_datetime(old_df[col], format="%d %m %Y", errors="coerce")
-
-            updated_ids = edited_df[id_column].astype(str).tolist()
-            old_df = old_df[~old_df[id_column].astype(str).isin(updated_ids)]
-            full_df = pd.concat([old_df, edited_df], ignore_index=True)
-            full_df.to_csv(file_path, index=False)
-            st.session_state[f"{key_prefix}_added_rows"] = pd.DataFrame()
-            st.success(f"✅ Saved {key_prefix} successfully.")
-            st.rerun()
+            if columns is not None:
+                # Carry the columns that were not loaded over from the stored rows
+                old_df = read_table(table)
+                untouched = old_df.drop(columns=[c for c in columns if c != id_column])
+                untouched[id_column] = untouched[id_column].astype(str)
+                edited_df = edited_df.assign(**{id_column: edited_df[id_column].astype(str)})
+                edited_df = edited_df.merge(untouched, on=id_column, how="left")[old_df.columns]
+
+            # Persist only the rows that actually changed
+            batch = stage({}, table, upserts=changed_rows(table, edited_df))
+            if _commit(batch):
+                st.session_state[f"{key_prefix}_added_rows"] = pd.DataFrame()
+                st.success(f"✅ Saved {key_prefix} successfully.")
+                st.rerun()
 
     # Delete
     to_delete = st.text_input(f"Enter {id_column} to delete ({key_prefix})")
     if st.button(f"🗑️ Delete {key_prefix}") and to_delete:
-        df = df[df[id_column].astype(str) != str(to_delete)]
-        df.to_csv(file_path, index=False)
-        st.success(f"✅ {id_column} {to_delete} deleted.")
-        st.rerun()
+        if _commit(stage({}, table, deletes=[to_delete])):
+            st.success(f"✅ {id_column} {to_delete} deleted.")
+            st.rerun()
+
+
+def _commit(batch):
+    """Commit `batch`, or list the references it would break. True when saved."""
+    # Version the cached frame must match for the save to be patched into it
+    signature = sources_signature()
+    violations = commit_batch(batch)
+    if len(violations):
+        st.error(f"❌ {len(violations):,} row(s) reference ids that do not exist. Nothing was saved.")
+        st.dataframe(violations, hide_index=True, width="stretch")
+        return False
+    refresh_after_batch(batch, signature)
+    return True
+
+
+def render_bulk_import(key_prefix):
+    """Load CSVs for several tables and commit them as one checked batch.
+
+    Each file is matched to a table by name (e.g. tasks.csv); its rows are
+    added or replace stored rows with the same id.
+    """
+    files = st.file_uploader(
+        "Bulk import CSVs (projects, tasks, costs, departments)",
+        type="csv", accept_multiple_files=True, key=f"{key_prefix}_files",
+    )
+    if not files or not st.button(f"📥 Import {len(files)} file(s)", key=f"{key_prefix}_import"):
+        return
+
+    batch = {}
+    for file in files:
+        table = file.name.rsplit(".", 1)[0].lower()
+        if table not in TABLES:
+            st.error(f"❌ {file.name} does not match a table name.")
+            return
+        stage(batch, table, upserts=pd.read_csv(file))
+    if _commit(batch):
+        rows = sum(len(entry["upserts"]) for entry in batch.values())
+        st.success(f"✅ Imported {rows:,} rows into {', '.join(batch)}.")
+
+
+def render_ingest(key_prefix):
+    """Stream large CSV or Excel exports into the store with a progress bar."""
+    files = st.file_uploader(
+        "Weekly exports (CSV or Excel, named after their table, e.g. tasks_week12.xlsx)",
+        type=["csv", "xlsx", "xlsm"], accept_multiple_files=True, key=f"{key_prefix}_files",
+    )
+    if not files or not st.button(f"🚚 Ingest {len(files)} file(s)", key=f"{key_prefix}_ingest"):
+        return
+
+    unknown = [file.name for file in files if table_for(file.name) is None]
+    if unknown:
+        st.error(f"❌ No table matches {', '.join(unknown)}.")
+        return
+
+    files = sorted(files, key=lambda file: LOAD_ORDER.index(table_for(file.name)))
+    bar = st.progress(0.0)
+    for file in files:
+        def show(report):
+            bar.progress(report["fraction"], text=(
+                f"{report['file']}: {report['rows_read']:,} rows read · "
+                f"{report['rows_per_second']:,.0f} rows/s"
+            ))
+
+        report = ingest(file, table_for(file.name), name=file.name, on_progress=show)
+        show(report)
+        st.success(
+            f"✅ {report['file']} → {report['table']}: {report['rows_written']:,} rows written, "
+            f"{report['duplicates']:,} duplicates, {report['rejected']:,} rejected "
+            f"in {report['seconds']:.1f}s."
+        )
+        if len(report["violations"]):
+            st.dataframe(report["violations"], hide_index=True, width="stretch")
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import store  # noqa: E402
+
+PROJECTS = pd.DataFrame({
+    "Project_ID": ["P001", "P002"],
+    "Project_Name": ["Borehole Drilling", "Camp Site Installation"],
+    "Location": ["Zone A", "Base Camp Area"],
+    "Start_Date": ["2-Jan-2025", "2-Jan-2025"],
+    "End_Date": ["31-Mar-25", "28-Feb-25"],
+    "Status": ["In Progress", "Planned"],
+    "Project_Completion": ["80%", "0%"],
+})
+DEPARTMENTS = pd.DataFrame({
+    "Department_ID": ["D001", "D002"],
+    "Department_Name": ["Planning", "Procurement"],
+    "Manager": ["Planner A", "Buyer B"],
+})
+TASKS = pd.DataFrame({
+    "Task_ID": ["T001", "T002", "T003"],
+    "Project_ID": ["P001", "P001", "P002"],
+    "Department_ID": ["D001", "D002", "D001"],
+    "Task_Name": ["Site Survey", "Issue RFQ", "Clear Site"],
+    "Est_Start": ["1-Jan-2025", "1-Feb-2025", "1-Jan-2025"],
+    "Est_End": ["1-Feb-2025", "1-Mar-2025", "1-Feb-2025"],
+    "Act_Start": ["1-Jan-2025", "", ""],
+    "Act_End": ["5-Feb-2025", "", ""],
+    "Delay_Days": [4, 0, 0],
+    "percent_complete": ["100%", "50%", "0%"],
+    "Assigned_To": ["John Doe", "Anna Smith", "John Doe"],
+    "Priority": ["High", "Medium", "Low"],
+    "Status": ["Completed", "In Progress", "Planned"],
+    "Comments": ["", "", ""],
+    "Planned_Duration": [31, 28, 31],
+    "Actual_Duration": [35, 0, 0],
+    "Last_Updated": ["2-Oct-25", "2-Oct-25", "2-Oct-25"],
+})
+COSTS = pd.DataFrame({
+    "Cost_ID": ["C001", "C002"],
+    "Task_ID": ["T001", "T002"],
+    "Budgeted_Cost": [5000, 3000],
+    "Actual_Cost": [5200, 1500],
+    "Hours_Allocated": [40, 20],
+    "Hours_Worked": [45, 10],
+    "Cost_of_Hours_Worked": [5400, 1200],
+    "Variance": [200, -1500],
+})
+
+
+@pytest.fixture
+def tables(tmp_path, monkeypatch):
+    """A working directory holding the four CSVs and an empty store."""
+    monkeypatch.chdir(tmp_path)
+    for name, df in (("projects", PROJECTS), ("departments", DEPARTMENTS), ("tasks", TASKS), ("costs", COSTS)):
+        df.to_csv(tmp_path / f"{name}.csv", index=False)
+    return tmp_path
+
+
+def task(task_id, **values):
+    """A task row based on T002, with `values` replacing its columns."""
+    row = TASKS[TASKS["Task_ID"] == "T002"].assign(Task_ID=task_id, **values)
+    return row.reset_index(drop=True)
+
+
+def stored(table, id_value):
+    """The stored rows of `table` with id `id_value`."""
+    df = store.read_table(table)
+    return df[df[store.TABLES[table]["id_column"]].astype(str) == id_value]
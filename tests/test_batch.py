@@ -0,0 +1,129 @@
+import json
+import os
+
+import pandas as pd
+
+import store
+from conftest import COSTS, TASKS, stored, task
+
+
+def _interrupted_batch(published=()):
+    """Stage a two-table batch and journal it, as if the commit crashed.
+
+    Tables in `published` had their segment swapped in before the crash.
+    """
+    moves = []
+    for table, upserts in (("tasks", task("T009")), ("costs", COSTS.head(1).assign(Cost_ID="C009", Task_ID="T009"))):
+        store.sync(table)
+        segment, _ = store._segment(table, upserts)
+        path = store._next_segment_path(table)
+        tmp_path = store._stage_parquet(path, segment, {})
+        if table in published:
+            os.replace(tmp_path, path)
+        moves.append((tmp_path, path))
+    with open(store._BATCH_JOURNAL, "w", encoding="utf-8") as journal:
+        json.dump(moves, journal)
+
+
+# --- Journal recovery ---
+def test_next_read_finishes_an_interrupted_batch(tables):
+    _interrupted_batch()
+
+    assert len(stored("tasks", "T009")) == 1
+    assert stored("costs", "C009")["Task_ID"].tolist() == ["T009"]
+    assert not os.path.exists(store._BATCH_JOURNAL)
+
+
+def test_recovery_skips_segments_already_published(tables):
+    _interrupted_batch(published=("tasks",))
+
+    assert len(stored("costs", "C009")) == 1
+    assert len(stored("tasks", "T009")) == 1
+    assert store._segments("tasks") == ["00000001.parquet"]
+    assert not os.path.exists(store._BATCH_JOURNAL)
+
+
+def test_batch_is_written_together(tables):
+    batch = store.stage({}, "tasks", upserts=task("T009"))
+    store.stage(batch, "costs", upserts=COSTS.head(1).assign(Cost_ID="C009", Task_ID="T009"))
+
+    assert store.commit_batch(batch).empty
+    assert store._segments("tasks") == ["00000001.parquet"]
+    assert store._segments("costs") == ["00000001.parquet"]
+    assert not os.path.exists(store._BATCH_JOURNAL)
+
+
+# --- Foreign keys ---
+def test_upsert_with_a_missing_reference_is_rejected(tables):
+    batch = store.stage({}, "tasks", upserts=task("T009", Project_ID="P404", Department_ID="D404"))
+
+    violations = store.commit_batch(batch)
+
+    assert sorted(violations["Column"]) == ["Department_ID", "Project_ID"]
+    assert set(violations["ID"]) == {"T009"}
+    assert store._segments("tasks") == []
+    assert stored("tasks", "T009").empty
+
+
+def test_upsert_may_reference_a_row_added_in_the_same_batch(tables):
+    batch = store.stage({}, "projects", upserts=pd.DataFrame({"Project_ID": ["P003"], "Project_Name": ["New"]}))
+    store.stage(batch, "tasks", upserts=task("T009", Project_ID="P003"))
+
+    assert store.commit_batch(batch).empty
+    assert stored("tasks", "T009")["Project_ID"].tolist() == ["P003"]
+
+
+def test_blank_reference_is_allowed(tables):
+    assert store.commit_batch(store.stage({}, "tasks", upserts=task("T009", Department_ID=None))).empty
+
+
+def test_delete_of_a_referenced_row_is_rejected(tables):
+    violations = store.commit_batch(store.stage({}, "tasks", deletes=["T001"]))
+
+    assert violations[["Table", "ID", "Column", "Value"]].values.tolist() == [["costs", "C001", "Task_ID", "T001"]]
+    assert len(stored("tasks", "T001")) == 1
+
+
+def test_delete_with_its_referencing_rows_is_allowed(tables):
+    batch = store.stage({}, "costs", deletes=["C001"])
+    store.stage(batch, "tasks", deletes=["T001"])
+
+    assert store.commit_batch(batch).empty
+    assert stored("tasks", "T001").empty
+    assert stored("costs", "C001").empty
+
+
+def test_delete_is_allowed_when_the_batch_repoints_references(tables):
+    batch = store.stage({}, "projects", deletes=["P002"])
+    store.stage(batch, "tasks", upserts=task("T003", Project_ID="P001"))
+
+    assert store.commit_batch(batch).empty
+    assert stored("projects", "P002").empty
+
+
+def test_upsert_of_a_row_deleted_in_the_same_batch_breaks_it(tables):
+    batch = store.stage({}, "tasks", deletes=["T003"])
+    store.stage(batch, "costs", upserts=COSTS.head(1).assign(Cost_ID="C009", Task_ID="T003"))
+
+    violations = store.commit_batch(batch)
+
+    assert violations["ID"].tolist() == ["C009"]
+    assert len(stored("tasks", "T003")) == 1
+
+
+def test_drop_broken_commits_the_valid_rows(tables):
+    upserts = pd.concat([task("T008"), task("T009", Project_ID="P404")], ignore_index=True)
+
+    violations = store.commit_batch(store.stage({}, "tasks", upserts=upserts), drop_broken=True)
+
+    assert violations["ID"].tolist() == ["T009"]
+    assert len(stored("tasks", "T008")) == 1
+    assert stored("tasks", "T009").empty
+
+
+def test_drop_broken_cannot_keep_a_referenced_row(tables):
+    violations = store.commit_batch(store.stage({}, "tasks", deletes=["T001"]), drop_broken=True)
+
+    assert violations["ID"].tolist() == ["C001"]
+    assert len(stored("tasks", "T001")) == 1
+    assert len(store.read_table("tasks")) == len(TASKS)
@@ -0,0 +1,88 @@
+import pandas as pd
+
+import store
+from conftest import TASKS, stored, task
+
+
+def commit(upserts=None, deletes=()):
+    violations = store.commit_batch(store.stage({}, "tasks", upserts=upserts, deletes=deletes))
+    assert violations.empty
+
+
+def test_save_appends_a_segment_without_touching_the_base(tables):
+    store.read_table("tasks")
+    base = store._file_signature(store.table_path("tasks"))
+
+    commit(upserts=task("T002", Delay_Days=7))
+
+    assert store._segments("tasks") == ["00000001.parquet"]
+    assert store._file_signature(store.table_path("tasks")) == base
+    assert stored("tasks", "T002")["Delay_Days"].tolist() == [7]
+
+
+def test_replay_applies_segments_in_commit_order(tables):
+    for delay in (1, 2, 3):
+        commit(upserts=task("T002", Delay_Days=delay))
+
+    df = store.read_table("tasks")
+    assert df["Task_ID"].tolist().count("T002") == 1
+    assert stored("tasks", "T002")["Delay_Days"].tolist() == [3]
+    assert len(df) == len(TASKS)
+
+
+def test_later_upserts_replace_earlier_ones_within_a_batch(tables):
+    batch = store.stage({}, "tasks", upserts=task("T002", Delay_Days=1))
+    store.stage(batch, "tasks", upserts=task("T002", Delay_Days=2))
+
+    assert store.commit_batch(batch).empty
+    assert stored("tasks", "T002")["Delay_Days"].tolist() == [2]
+
+
+def test_upsert_then_delete_removes_the_row(tables):
+    commit(upserts=task("T009"))
+    assert len(stored("tasks", "T009")) == 1
+
+    commit(deletes=["T009"])
+
+    assert stored("tasks", "T009").empty
+    assert len(store.read_table("tasks")) == len(TASKS)
+
+
+def test_delete_then_upsert_restores_the_row(tables):
+    commit(deletes=["T003"])
+    commit(upserts=task("T003", Task_Name="Clear Site again"))
+
+    assert stored("tasks", "T003")["Task_Name"].tolist() == ["Clear Site again"]
+
+
+def test_column_reads_replay_the_log(tables):
+    commit(upserts=task("T002", Delay_Days=9))
+    commit(deletes=["T003"])
+
+    df = store.read_table("tasks", columns=["Delay_Days"])
+
+    assert list(df.columns) == ["Delay_Days"]
+    assert sorted(df["Delay_Days"].tolist()) == [4, 9]
+
+
+def test_compaction_folds_the_log_into_base_and_csv(tables):
+    commit(upserts=task("T002", Delay_Days=5))
+    commit(deletes=["T003"])
+    before = store.read_table("tasks")
+
+    store.compact("tasks")
+
+    assert store._segments("tasks") == []
+    assert not (tables / "tasks.csv.tmp").exists()
+    pd.testing.assert_frame_equal(store.read_table("tasks"), before, check_dtype=False)
+    csv = pd.read_csv(tables / "tasks.csv")
+    assert csv["Task_ID"].tolist() == ["T001", "T002"]
+    assert csv.loc[csv["Task_ID"] == "T002", "Delay_Days"].tolist() == [5]
+
+
+def test_edited_csv_is_reimported(tables):
+    store.read_table("tasks")
+    edited = TASKS.assign(Delay_Days=TASKS["Delay_Days"] + 10)
+    edited.to_csv(tables / "tasks.csv", index=False)
+
+    assert sorted(store.read_table("tasks")["Delay_Days"].tolist()) == [10, 10, 14]
@@ -0,0 +1,129 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from visuals.figure_cache import show_figure
+
+# Critical-path tasks listed per project before the table is cut off
+MAX_PATH_ROWS = 200
+
+_CURVE_COLORS = {'PV': '#2E86AB', 'EV': '#27AE60', 'AC': '#E76F3C'}
+_LINKS = {
+    "listed": "task dependencies from the Predecessors column",
+    "inferred": "dependencies inferred from the plan (each task follows the last one finishing before it starts)",
+}
+
+
+def show_earned_value(view):
+    """Home panel: portfolio S-curves and each project's SPI against CPI."""
+    st.subheader("📈 Earned Value")
+    if view is None:
+        st.warning("No scheduled tasks to measure.")
+        return
+    st.caption(
+        f"Whole schedule, progress as of {view['as_of'].strftime('%d %B %Y')}. "
+        "SPI = EV / PV (schedule), CPI = EV / AC (cost); below 1 is behind or over budget."
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        show_figure(
+            "home_ev_curve", ev_curve, view['portfolio'], view['as_of'], "Portfolio PV, EV and AC",
+            use_container_width=True,
+        )
+    with col2:
+        show_figure("home_ev_indices", performance_scatter, view['summary'], use_container_width=True)
+
+
+def show_project_schedule(view, project):
+    """Projects panel: one project's earned value and its critical path."""
+    st.subheader("📈 Earned Value & Critical Path")
+    if view is None:
+        st.warning("No scheduled tasks to measure.")
+        return
+    summary = view['summary'][view['summary']['Project_Name'] == project]
+    if summary.empty:
+        st.warning("No scheduled tasks for the selected project.")
+        return
+    kpis = summary.iloc[0]
+    st.caption(
+        f"Whole schedule, progress as of {view['as_of'].strftime('%d %B %Y')}; "
+        f"critical path from {_LINKS[view['links']]}."
+    )
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("⏱️ SPI", _ratio(kpis['SPI']))
+    col2.metric("💰 CPI", _ratio(kpis['CPI']))
+    col3.metric("📦 Earned Value", f"{kpis['EV']:,.0f}", help=f"Budget at completion {kpis['BAC']:,.0f}")
+    col4.metric(
+        "🛤️ Critical Path", "–" if pd.isna(kpis['Critical_Path_Days']) else f"{kpis['Critical_Path_Days']:.0f} days",
+        help=f"{kpis['Critical_Tasks']:.0f} critical tasks",
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        curve = view['curves'][view['curves']['Project_Name'] == project]
+        show_figure("pro_ev_curve", ev_curve, curve, view['as_of'], f"Earned Value – {project}", use_container_width=True)
+    with col2:
+        path = view['path']
+        path = path[(path['Project_Name'] == project) & path['Critical']].sort_values('ES')
+        st.markdown("**Critical path**")
+        st.dataframe(
+            path[['Task_Name', 'Early_Start', 'Early_Finish', 'Duration', 'Slack']].head(MAX_PATH_ROWS),
+            hide_index=True,
+            column_config={
+                'Task_Name': "Task",
+                'Early_Start': st.column_config.DateColumn("Start", format="DD MMM YYYY"),
+                'Early_Finish': st.column_config.DateColumn("Finish", format="DD MMM YYYY"),
+                'Duration': st.column_config.NumberColumn("Days", format="%.0f"),
+                'Slack': st.column_config.NumberColumn("Float", format="%.0f"),
+            },
+        )
+
+
+def _ratio(value):
+    return "–" if pd.isna(value) else f"{value:.2f}"
+
+
+# --- Figure builders (pure, so their results can be cached) ---
+def ev_curve(curve, as_of, title):
+    """PV over the whole plan; EV and AC up to the status date."""
+    fig = go.Figure()
+    reported = curve[curve['Date'] <= as_of]
+    for measure, data, name in (
+        ('PV', curve, 'Planned Value (PV)'),
+        ('EV', reported, 'Earned Value (EV)'),
+        ('AC', reported, 'Actual Cost (AC)'),
+    ):
+        fig.add_trace(go.Scatter(
+            x=data['Date'], y=data[measure], name=name, mode='lines',
+            line=dict(color=_CURVE_COLORS[measure], width=2),
+        ))
+    fig.add_vline(x=as_of, line_dash="dash", line_color="#7F8C8D")
+    fig.update_layout(
+        title=title,
+        template="plotly_white",
+        height=350,
+        yaxis_title="Cost (Pula)",
+        legend=dict(orientation="h", y=-0.2),
+        margin=dict(l=10, r=10, t=40, b=10),
+    )
+    return fig
+
+
+def performance_scatter(summary):
+    data = summary.dropna(subset=['SPI', 'CPI'])
+    fig = px.scatter(
+        data,
+        x='CPI',
+        y='SPI',
+        size='BAC',
+        hover_name='Project_Name',
+        hover_data={'PV': ':,.0f', 'EV': ':,.0f', 'AC': ':,.0f', 'BAC': ':,.0f'},
+        title="Schedule vs Cost Performance (SPI vs CPI)",
+        color_discrete_sequence=px.colors.qualitative.Set2,
+    )
+    fig.add_hline(y=1, line_dash="dot", line_color="#7F8C8D")
+    fig.add_vline(x=1, line_dash="dot", line_color="#7F8C8D")
+    fig.update_layout(template="plotly_white", height=350, margin=dict(l=10, r=10, t=40, b=10))
+    return fig
@@ -0,0 +1,97 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from profiling import stage
+
+# Figures kept per browser session, least recently used evicted first once
+# either cap is reached. Sizes are estimated from the traces' data arrays
+# (serializing a figure just to measure it would double the cost of a miss).
+MAX_FIGURES = 32
+MAX_FIGURE_BYTES = 20_000_000
+
+# Trace properties holding one value per point, and the JSON bytes a value
+# is counted as
+_TRACE_ARRAYS = ("x", "y", "z", "base", "text", "hovertext", "customdata", "ids", "labels", "values")
+_BYTES_PER_VALUE = 16
+
+_STATE_KEY = "_figure_cache"
+
+
+def fingerprint(*inputs):
+    """Stable digest of chart inputs: frames by their hashed values, the rest by repr."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in inputs:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            columns = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+            digest.update(repr((type(value).__name__, columns, value.shape)).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _estimated_bytes(figure):
+    """Rough JSON size of `figure`, from the number of values its traces carry."""
+    values = 0
+    for trace in figure.data:
+        for name in _TRACE_ARRAYS:
+            value = getattr(trace, name, None)
+            if value is None or isinstance(value, str):
+                continue
+            values += value.size if isinstance(value, np.ndarray) else len(value)
+    return values * _BYTES_PER_VALUE
+
+
+def _cache():
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = {"figures": OrderedDict(), "bytes": 0, "hits": 0, "misses": 0}
+    return st.session_state[_STATE_KEY]
+
+
+def cached_figure(name, build, *inputs):
+    """`build(*inputs)`, reused while `inputs` fingerprint the same.
+
+    `name` tells charts with identical inputs apart. The returned figure is
+    shared with later reruns, so callers must not modify it.
+    """
+    cache = _cache()
+    key = (name, fingerprint(*inputs))
+    figures = cache["figures"]
+    if key in figures:
+        figures.move_to_end(key)
+        cache["hits"] += 1
+        return figures[key][0]
+
+    cache["misses"] += 1
+    with stage(f"figure.{name}") as record:
+        figure = build(*inputs)
+        if inputs and hasattr(inputs[0], "__len__"):
+            record["rows"] = len(inputs[0])
+    size = _estimated_bytes(figure)
+    figures[key] = (figure, size)
+    cache["bytes"] += size
+    while len(figures) > 1 and (len(figures) > MAX_FIGURES or cache["bytes"] > MAX_FIGURE_BYTES):
+        _, (_, evicted) = figures.popitem(last=False)
+        cache["bytes"] -= evicted
+    return figure
+
+
+def show_figure(name, build, *inputs, **chart_options):
+    """`st.plotly_chart` of the cached figure, timing Streamlit's serialization."""
+    figure = cached_figure(name, build, *inputs)
+    with stage(f"render.{name}"):
+        st.plotly_chart(figure, **chart_options)
+
+
+def figure_cache_stats():
+    """Hit/miss counters and size of this session's figure cache."""
+    cache = _cache()
+    return {
+        "hits": cache["hits"], "misses": cache["misses"],
+        "entries": len(cache["figures"]), "bytes": cache["bytes"],
+    }
@@ -7,39 +7,56 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from analytics import DETAIL_LEVELS
+from snapshots import timeline
+from visuals.figure_cache import show_figure
 
-def show_gantt_chart(df):
+
+def gantt_height(rows):
+    """Figure height that grows with the bars drawn, within sane bounds."""
+    return int(min(max(150 + 22 * rows, 350), 1200))
+
+
+def show_gantt_chart(view, start_date=None, end_date=None):
     st.subheader("📅 Project Timeline (Gantt Chart)")
 
-    # ---- Filters ----
+    # ---- Filters (options from the Home view, bars computed in analytics.py) ----
     col1, col2 = st.columns(2)
     with col1:
-        selected_proj = st.selectbox("Filter by Project", ["All"] + sorted(df['Project_Name'].dropna().unique().tolist()))
+        selected_proj = st.selectbox("Filter by Project", ["All"] + view['projects'])
     with col2:
-        selected_dept = st.selectbox("Filter by Department", ["All"] + sorted(df['Department_Name'].dropna().unique().tolist()))
+        selected_dept = st.selectbox("Filter by Department", ["All"] + view['departments'])
+    detail = st.radio("Detail", DETAIL_LEVELS, horizontal=True, key="gantt_detail")
 
-    if selected_proj != "All":
-        df = df[df['Project_Name'] == selected_proj]
-    if selected_dept != "All":
-        df = df[df['Department_Name'] == selected_dept]
+    gantt = timeline(
+        project=None if selected_proj == "All" else selected_proj,
+        department=None if selected_dept == "All" else selected_dept,
+        start=start_date,
+        end=end_date,
+        detail=detail,
+    )
 
     # ---- Validate Columns ----
-    required_cols = ['Task_Name', 'Project_Name', 'Department_Name', 'Start_Date', 'End_Date', 'Status']
-    missing = [c for c in required_cols if c not in df.columns]
-    if missing:
-        st.error(f"Missing columns for Gantt chart: {', '.join(missing)}")
+    if gantt['missing']:
+        st.error(f"Missing columns for Gantt chart: {', '.join(gantt['missing'])}")
         return
 
-    # ---- Clean & Format ----
-    df['Start_Date'] = pd.to_datetime(df['Start_Date'], errors='coerce')
-    df['End_Date'] = pd.to_datetime(df['End_Date'], errors='coerce')
-    df = df.dropna(subset=['Start_Date', 'End_Date'])
-    df['Duration_Days'] = (df['End_Date'] - df['Start_Date']).dt.days
-
-    if df.empty:
+    if gantt['tasks'] == 0:
         st.warning("No valid timeline data found for selected filters.")
         return
 
+    bars = gantt['bars']
+    if len(bars) < gantt['tasks']:
+        st.caption(
+            f"Showing {len(bars)} {gantt['level'].lower()} bars for {gantt['tasks']} tasks. "
+            "Narrow the date range or filters to see more detail."
+        )
+
+    show_figure("gantt", build_gantt_figure, bars, use_container_width=True)
+
+
+def build_gantt_figure(df):
+    """Timeline figure for cleaned task rows (no Streamlit calls, for benchmarks)."""
     # ---- Build Gantt Chart ----
     fig = px.timeline(
         df,
@@ -52,7 +69,8 @@ def show_gantt_chart(df):
             "Department_Name": True,
             "Start_Date": True,
             "End_Date": True,
-            "Duration_Days": True
+            "Duration_Days": True,
+            **({"Tasks": True} if "Tasks" in df.columns else {})
         },
         color_discrete_map={
             "Planned": "#F4A261",
@@ -78,12 +96,12 @@ def show_gantt_chart(df):
         tickangle=-45
     )
 
-    # ---- Add Milestones ----
+    # ---- Add Milestones (one marker trace for all completed tasks) ----
     completed = df[df['Status'].str.lower().isin(['completed', 'done', 'finished'])]
-    for _, row in completed.iterrows():
+    if not completed.empty:
         fig.add_trace(go.Scatter(
-            x=[row['End_Date']],
-            y=[row['Task_Name']],
+            x=completed['End_Date'].to_numpy(),
+            y=completed['Task_Name'].to_numpy(),
             mode="markers",
             marker_symbol="diamond",
             marker_size=10,
@@ -113,7 +131,7 @@ def show_gantt_chart(df):
     # ---- Layout ----
     fig.update_layout(
         template="plotly_white",
-        height=700,
+        height=gantt_height(df['Task_Name'].nunique()),
         margin=dict(l=120, r=30, t=60, b=60),
         title_x=0.5,
         bargap=0.3,
@@ -123,6 +141,6 @@ def show_gantt_chart(df):
         plot_bgcolor="white"
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
     
\ No newline at end of file
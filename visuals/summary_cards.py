@@ -7,12 +7,12 @@ import streamlit as st
 
 import streamlit as st
 
-def show_summary_cards(df):
-    # --- KPIs ---
-    total_projects = df['Project_ID'].nunique()
-    total_tasks = len(df)
-    avg_delay = round(df['Delay_Days'].sum())
-    avg_completion = round(df['percent_complete'].mean(), 1)
+def show_summary_cards(kpis):
+    # --- KPIs (portfolio totals from analytics.home_view) ---
+    total_projects = kpis['total_projects']
+    total_tasks = kpis['total_tasks']
+    avg_delay = round(kpis['total_delay'])
+    avg_completion = round(kpis['avg_completion'], 1)
 
     # --- Custom CSS for button-like card styling ---
     st.markdown("""